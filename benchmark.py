@@ -0,0 +1,143 @@
+# benchmark.py
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+from ortools.sat.python import cp_model
+from data_loader import carregar_dados, reduzir_turmas
+from optimizer import ConfiguracaoSolver, construir_modelo, extrair_grade
+from gerador_sintetico import gerar_curriculo, salvar_curriculo
+from perfil import pico_memoria_mb
+from parametros import CREDITOS_MINIMOS
+
+DISCIPLINAS_BASE = 159  # tamanho do catálogo em 'attempt1'
+
+
+def executar_caso(caso):
+    """
+    Executa carregamento, construção, resolução e extração para um caso e mede cada fase.
+    Roda em um processo próprio, para que o pico de memória de um tamanho não contamine o próximo.
+    """
+    resultado = {"fator": caso["fator"], "fases": {}}
+
+    def registrar(fase, inicio):
+        resultado["fases"][fase] = {"tempo_s": round(time.perf_counter() - inicio, 4), "pico_memoria_mb": pico_memoria_mb()}
+
+    inicio = time.perf_counter()
+    dados = reduzir_turmas(carregar_dados(caso["caminho_disciplinas"], caso["caminho_ofertas"]))
+    registrar("carregamento", inicio)
+
+    inicio = time.perf_counter()
+    modelo = construir_modelo(dados, caso["creditos_minimos"], caso["num_semestres"], caso["creditos_maximos"])
+    registrar("construcao", inicio)
+
+    inicio = time.perf_counter()
+    solver = cp_model.CpSolver()
+    ConfiguracaoSolver(tempo_limite=caso["tempo_limite"]).aplicar(solver)
+    status = solver.Solve(modelo["model"])
+    registrar("resolucao", inicio)
+
+    inicio = time.perf_counter()
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        extrair_grade(dados, modelo, solver)
+        resultado["objetivo"] = solver.ObjectiveValue()
+    registrar("extracao", inicio)
+
+    proto = modelo["model"].Proto()
+    resultado.update({
+        "disciplinas": len(dados["disciplinas"]),
+        "turmas": sum(len(t) for t in dados["turmas_por_disciplina"].values()),
+        "variaveis": len(proto.variables),
+        "restricoes": len(proto.constraints),
+        "status": solver.StatusName(status),
+    })
+    return resultado
+
+
+def versao_atual():
+    """Commit atual do repositório, para identificar o relatório."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(relatorio, caminho_base):
+    """Imprime a razão (atual / base) dos tempos de cada fase para os fatores presentes nos dois relatórios."""
+    with open(caminho_base, 'r', encoding='utf-8') as f:
+        base = {r["fator"]: r for r in json.load(f)["resultados"]}
+    print(f"\nComparação com '{caminho_base}' (atual / base):")
+    for r in relatorio["resultados"]:
+        if r["fator"] not in base:
+            continue
+        razoes = []
+        for fase, medida in r["fases"].items():
+            tempo_base = base[r["fator"]]["fases"].get(fase, {}).get("tempo_s")
+            if tempo_base:
+                razoes.append(f"{fase}={medida['tempo_s'] / tempo_base:.2f}x")
+        print(f"  {r['fator']:>5}x: " + ", ".join(razoes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o desempenho do pipeline em currículos sintéticos de tamanho crescente.")
+    parser.add_argument("--fatores", type=float, nargs="+", default=[1, 2, 10, 50],
+                        help=f"Tamanhos relativos ao catálogo real ({DISCIPLINAS_BASE} disciplinas)")
+    parser.add_argument("--turmas", type=float, default=3)
+    parser.add_argument("--profundidade", type=int, default=6)
+    parser.add_argument("--paridade", type=float, default=0.2)
+    parser.add_argument("--densidade", type=float, default=0.1)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--semestres", type=int, default=10)
+    parser.add_argument("--creditos-maximos", type=int, default=32)
+    parser.add_argument("--tempo-limite", type=float, default=60.0, help="Tempo limite do solver por caso (s)")
+    parser.add_argument("--saida", default="benchmark_relatorio.json")
+    parser.add_argument("--comparar", help="Relatório anterior para comparação")
+    args = parser.parse_args()
+
+    creditos_minimos = CREDITOS_MINIMOS
+    relatorio = {
+        "versao": versao_atual(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "parametros": vars(args),
+        "resultados": [],
+    }
+
+    contexto = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as diretorio_tmp:
+        for fator in args.fatores:
+            disciplinas, ofertas = gerar_curriculo(
+                int(DISCIPLINAS_BASE * fator), args.turmas, args.profundidade, args.paridade, args.densidade, semente=args.semente
+            )
+            caminho_disciplinas, caminho_ofertas = salvar_curriculo(disciplinas, ofertas, os.path.join(diretorio_tmp, f"f{fator}"))
+            caso = {
+                "fator": fator,
+                "caminho_disciplinas": caminho_disciplinas,
+                "caminho_ofertas": caminho_ofertas,
+                "creditos_minimos": creditos_minimos,
+                "num_semestres": args.semestres,
+                "creditos_maximos": args.creditos_maximos,
+                "tempo_limite": args.tempo_limite,
+            }
+            with contexto.Pool(1) as pool:
+                resultado = pool.apply(executar_caso, (caso,))
+            relatorio["resultados"].append(resultado)
+
+            fases = ", ".join(f"{fase}={m['tempo_s']:.2f}s" for fase, m in resultado["fases"].items())
+            print(f"{fator:>5}x: {resultado['disciplinas']} disciplinas, {resultado['variaveis']} variáveis, "
+                  f"{resultado['status']} | {fases} | pico {resultado['fases']['extracao']['pico_memoria_mb']:.0f} MB")
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\nRelatório salvo em '{args.saida}'.")
+
+    if args.comparar:
+        comparar(relatorio, args.comparar)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# benchmark_construcao.py
+import time
+from data_loader import carregar_dados, indexar_horarios
+from optimizer import construir_modelo
+from parametros import (
+    CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS, CREDITOS_MAXIMOS_POR_SEMESTRE, CREDITOS_MINIMOS, NUM_SEMESTRES
+)
+
+def replicar_dados(dados, fator):
+    """
+    Gera uma entrada sintética maior replicando o catálogo 'fator' vezes.
+    Cada cópia recebe um sufixo nos IDs de disciplinas e turmas (inclusive nos pré-requisitos),
+    de forma que o tamanho de 'alocacao' cresce linearmente com o fator. Todas as chaves de
+    'carregar_dados' são replicadas, para que o modelo seja montado como o de uma carga real.
+    """
+    if fator == 1:
+        return dados
+
+    def sufixo(k):
+        return "" if k == 0 else f"_{k}"
+
+    disciplinas = {}
+    turmas_por_disciplina = {}
+    horarios_por_turma = {}
+    periodos_por_turma = {}
+    periodos_validos_por_disciplina = {}
+    eletivas_livres = {}
+    turmas_livres_por_horarios = {}
+    disciplinas_sem_oferta = {}
+    turmas_duplicadas = []
+    categorias = {"obrigatorias_ids": [], "restritas_ids": [], "condicionadas_ids": [], "livres_ids": []}
+
+    for k in range(fator):
+        for d_id, disc in dados["disciplinas"].items():
+            novo_id = d_id + sufixo(k)
+            disciplinas[novo_id] = dict(disc, id=novo_id, prerequisitos=[p + sufixo(k) for p in disc.get("prerequisitos", [])])
+            turmas_por_disciplina[novo_id] = [t_id + sufixo(k) for t_id in dados["turmas_por_disciplina"].get(d_id, [])]
+            for t_id in dados["turmas_por_disciplina"].get(d_id, []):
+                horarios_por_turma[t_id + sufixo(k)] = dados["horarios_por_turma"].get(t_id, [])
+                if t_id in dados["periodos_por_turma"]:
+                    periodos_por_turma[t_id + sufixo(k)] = dados["periodos_por_turma"][t_id]
+            if d_id in dados["periodos_validos_por_disciplina"]:
+                periodos_validos_por_disciplina[novo_id] = dados["periodos_validos_por_disciplina"][d_id]
+            if d_id in dados["eletivas_livres"]:
+                eletivas_livres[novo_id] = dados["eletivas_livres"][d_id]
+                turmas_livres_por_horarios[novo_id] = {
+                    horarios: t_id + sufixo(k) for horarios, t_id in dados["turmas_livres_por_horarios"][d_id].items()
+                }
+        disciplinas_sem_oferta.update({d_id + sufixo(k): tipo for d_id, tipo in dados["disciplinas_sem_oferta"].items()})
+        turmas_duplicadas.extend(t_id + sufixo(k) for t_id in dados["turmas_duplicadas"])
+        for chave in categorias:
+            categorias[chave].extend(d_id + sufixo(k) for d_id in dados[chave])
+
+    return {
+        "disciplinas": disciplinas,
+        "turmas_por_disciplina": turmas_por_disciplina,
+        "horarios_por_turma": horarios_por_turma,
+        "periodos_por_turma": periodos_por_turma,
+        "periodos_validos_por_disciplina": periodos_validos_por_disciplina,
+        "eletivas_livres": eletivas_livres,
+        "turmas_livres_por_horarios": turmas_livres_por_horarios,
+        "turmas_duplicadas": turmas_duplicadas,
+        "disciplinas_sem_oferta": disciplinas_sem_oferta,
+        **indexar_horarios(turmas_por_disciplina, horarios_por_turma),
+        **categorias,
+    }
+
+
+def medir_construcao(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, repeticoes=3):
+    """Retorna o menor tempo de construção do modelo (em segundos) e o número de variáveis de alocação."""
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        modelo = construir_modelo(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor, len(modelo["alocacao"])
+
+
+def main():
+    FATORES = [1, 2, 5, 10, 20]
+
+    dados = carregar_dados(CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS)
+
+    print(f"\n{'Fator':>6} {'Disciplinas':>12} {'Variáveis':>10} {'Construção (s)':>15} {'µs/variável':>12}")
+    for fator in FATORES:
+        dados_fator = replicar_dados(dados, fator)
+        tempo, num_vars = medir_construcao(dados_fator, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+        print(f"{fator:>6} {len(dados_fator['disciplinas']):>12} {num_vars:>10} {tempo:>15.3f} {1e6 * tempo / num_vars:>12.1f}")
+
+if __name__ == '__main__':
+    main()
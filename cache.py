@@ -0,0 +1,121 @@
+# cache.py
+import hashlib
+import json
+import os
+import tempfile
+from ortools.sat.python import cp_model
+from data_loader import SEMESTRE_MINIMO_POR_DISCIPLINA
+from resultado import PlanoGrade
+
+DIRETORIO_CACHE = ".cache_grade"
+TAMANHO_MAXIMO_CACHE = 50 * 1024 * 1024  # bytes
+VERSAO_CACHE = 2
+
+# Módulos que definem o modelo: mudar o código invalida as entradas antigas
+MODULOS_DO_MODELO = ["data_loader.py", "optimizer.py", "limites.py", "heuristica.py"]
+
+
+def _normalizar(valor):
+    """Converte conjuntos, tuplas e chaves não textuais em uma forma JSON estável (ordenada)."""
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v) for k, v in sorted(valor.items(), key=lambda item: str(item[0]))}
+    if isinstance(valor, (set, frozenset)):
+        return sorted(_normalizar(v) for v in valor)
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    return valor
+
+
+def chave_cache(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, modo="otimizacao",
+                objetivos_secundarios=(), quebrar_simetrias=True, portfolio=0):
+    """
+    Hash SHA-256 da entrada normalizada (disciplinas, turmas, horários, períodos, categorias),
+    dos parâmetros, do modo de resolução (com os objetivos secundários, a quebra de simetrias e o
+    número de membros do portfólio, que mudam a grade devolvida) e do código dos módulos do modelo.
+    """
+    # Só os horários das turmas do currículo: com um catálogo compartilhado (ver 'catalogo.py'),
+    # 'horarios_por_turma' também tem as turmas dos outros currículos
+    turmas_do_curriculo = [t_id for turmas in dados["turmas_por_disciplina"].values() for t_id in turmas]
+    turmas_do_curriculo += [t_id for turmas in dados["turmas_livres_por_horarios"].values() for t_id in turmas.values()]
+    entrada = {
+        "versao": VERSAO_CACHE,
+        "dados": {
+            chave: _normalizar(dados[chave])
+            for chave in (
+                "disciplinas", "turmas_por_disciplina", "periodos_validos_por_disciplina",
+                "eletivas_livres", "obrigatorias_ids", "restritas_ids", "condicionadas_ids", "livres_ids",
+            )
+        },
+        "horarios_por_turma": _normalizar({t_id: dados["horarios_por_turma"].get(t_id, []) for t_id in turmas_do_curriculo}),
+        "semestre_minimo": _normalizar(SEMESTRE_MINIMO_POR_DISCIPLINA),
+        "parametros": [_normalizar(creditos_minimos), NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, modo,
+                       list(objetivos_secundarios), quebrar_simetrias, portfolio],
+    }
+    h = hashlib.sha256(json.dumps(entrada, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    diretorio_codigo = os.path.dirname(os.path.abspath(__file__))
+    for modulo in MODULOS_DO_MODELO:
+        with open(os.path.join(diretorio_codigo, modulo), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def resultado_definitivo(status, modo="otimizacao"):
+    """
+    Só vale guardar o que não depende do tempo limite: ótimo ou infactibilidade provados
+    (ou qualquer resultado do modo rápido, que é determinístico).
+    """
+    return modo == "rapido" or status in (cp_model.OPTIMAL, cp_model.INFEASIBLE)
+
+
+def carregar_do_cache(chave, diretorio=DIRETORIO_CACHE):
+    """Retorna (grade, creditos_por_semestre, status, objetivo) guardados para a chave, ou None."""
+    caminho = os.path.join(diretorio, f"{chave}.json")
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            entrada = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(caminho)  # marca como usado recentemente (para a remoção LRU)
+    except OSError:
+        pass  # removida por outro processo depois da leitura: o conteúdo lido continua válido
+
+    # JSON só tem chaves de texto: os semestres dos créditos voltam a ser inteiros
+    grade = PlanoGrade.de_dict(entrada["grade"]) if entrada["grade"] is not None else None
+    creditos = {int(s): c for s, c in entrada["creditos"].items()} if entrada["creditos"] is not None else None
+    return grade, creditos, getattr(cp_model, entrada["status"]), entrada["objetivo"]
+
+
+def salvar_no_cache(chave, resultado, diretorio=DIRETORIO_CACHE, tamanho_maximo=TAMANHO_MAXIMO_CACHE):
+    """
+    Grava (grade, creditos_por_semestre, status, objetivo) para a chave e remove as entradas usadas
+    há mais tempo até o diretório voltar a caber em 'tamanho_maximo' bytes.
+    """
+    grade, creditos, status, objetivo = resultado
+    conteudo = json.dumps({
+        "grade": grade.para_dict() if grade is not None else None,
+        "creditos": creditos, "status": status.name, "objetivo": objetivo,
+    }, ensure_ascii=False)
+    os.makedirs(diretorio, exist_ok=True)
+    # Escrita atômica: um processo interrompido nunca deixa uma entrada pela metade
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=diretorio, suffix=".tmp", delete=False) as f:
+        f.write(conteudo)
+    os.replace(f.name, os.path.join(diretorio, f"{chave}.json"))
+    remover_excedente(diretorio, tamanho_maximo)
+
+
+def remover_excedente(diretorio=DIRETORIO_CACHE, tamanho_maximo=TAMANHO_MAXIMO_CACHE):
+    """Remove as entradas menos usadas recentemente até o tamanho total ficar abaixo do limite."""
+    entradas = []
+    for nome in os.listdir(diretorio):
+        if not nome.endswith(".json"):
+            continue
+        estado = os.stat(os.path.join(diretorio, nome))
+        entradas.append((estado.st_mtime, estado.st_size, nome))
+
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, nome in sorted(entradas):
+        if total <= tamanho_maximo:
+            break
+        os.remove(os.path.join(diretorio, nome))
+        total -= tamanho
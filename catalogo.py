@@ -0,0 +1,82 @@
+# catalogo.py
+import argparse
+import json
+import time
+from data_loader import indexar_blocos, indexar_ofertas, ler_ofertas, montar_dados, reduzir_turmas
+from heuristica import construir_grade_gulosa
+from optimizer import ConfiguracaoSolver, resolver_grade
+from parametros import CREDITOS_MAXIMOS_POR_SEMESTRE, CREDITOS_MINIMOS, NUM_SEMESTRES
+from perfil import pico_memoria_mb
+
+
+class Catalogo:
+    """
+    Ofertas carregadas uma única vez e indexadas por disciplina, compartilhadas por vários currículos.
+
+    Cada currículo ('adicionar_curriculo') guarda só os próprios metadados: disciplinas, categorias,
+    e créditos mínimos. As listas de turmas, os horários, os períodos e o índice de horários (com as
+    bitmasks de cada turma) são os do catálogo, referenciados sem cópia.
+    """
+
+    def __init__(self, caminho_ofertas, disciplinas_ids=None):
+        # 'disciplinas_ids' (a união dos currículos, se já conhecida) descarta na leitura as ofertas que ninguém usa
+        self.ofertas = indexar_ofertas(ler_ofertas(caminho_ofertas, disciplinas_ids))
+        turmas = [t_id for turmas_d in self.ofertas["turmas_por_disciplina"].values() for t_id in turmas_d]
+        self.blocos = indexar_blocos(turmas, self.ofertas["horarios_por_turma"])
+        self.curriculos = {}
+
+    def adicionar_curriculo(self, nome, caminho_disciplinas, creditos_minimos=CREDITOS_MINIMOS):
+        """Carrega um 'disciplinas.json' sobre as ofertas do catálogo e retorna os dados (como 'carregar_dados')."""
+        with open(caminho_disciplinas, 'r', encoding='utf-8') as f:
+            disciplinas_data = json.load(f)
+        dados = montar_dados(disciplinas_data, self.ofertas, blocos=self.blocos)
+        self.curriculos[nome] = {"dados": dados, "creditos_minimos": dict(creditos_minimos)}
+        return dados
+
+    def planejar(self, nome, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, configuracao=None):
+        """Resolve a grade de um currículo do catálogo; retorna o mesmo que 'resolver_grade'."""
+        curriculo = self.curriculos[nome]
+        creditos_minimos = curriculo["creditos_minimos"]
+        dados = reduzir_turmas(curriculo["dados"])
+        dica = construir_grade_gulosa(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+        return resolver_grade(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE,
+                              dica=dica, configuracao=configuracao)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planeja vários currículos sobre um único arquivo de ofertas.")
+    parser.add_argument("ofertas", help="Arquivo de ofertas compartilhado (array JSON ou JSON lines)")
+    parser.add_argument("programas", help="Arquivo JSON com a lista de currículos: "
+                                          "[{nome, disciplinas, creditos_minimos?, num_semestres?, creditos_maximos?}]")
+    parser.add_argument("--tempo-limite", type=float, default=60.0, help="Tempo limite do solver por currículo (s)")
+    args = parser.parse_args()
+
+    with open(args.programas, 'r', encoding='utf-8') as f:
+        programas = json.load(f)
+
+    # Só as ofertas de alguma disciplina de algum currículo ficam em memória
+    disciplinas_ids = set()
+    for programa in programas:
+        with open(programa["disciplinas"], 'r', encoding='utf-8') as f:
+            disciplinas_ids.update(d['id'] for d in json.load(f))
+
+    inicio = time.perf_counter()
+    catalogo = Catalogo(args.ofertas, disciplinas_ids)
+    print(f"Catálogo: {len(catalogo.ofertas['horarios_por_turma'])} turmas de "
+          f"{len(catalogo.ofertas['turmas_por_disciplina'])} disciplinas ({time.perf_counter() - inicio:.2f} s).")
+
+    configuracao = ConfiguracaoSolver(tempo_limite=args.tempo_limite)
+    for programa in programas:
+        nome = programa["nome"]
+        catalogo.adicionar_curriculo(nome, programa["disciplinas"], programa.get("creditos_minimos", CREDITOS_MINIMOS))
+        inicio = time.perf_counter()
+        _, _, status, obj_value = catalogo.planejar(
+            nome, programa.get("num_semestres", NUM_SEMESTRES), programa.get("creditos_maximos", CREDITOS_MAXIMOS_POR_SEMESTRE),
+            configuracao=configuracao
+        )
+        print(f"{nome}: {status.name}, {obj_value} semestres ({time.perf_counter() - inicio:.2f} s)")
+
+    print(f"\n{len(programas)} currículos; pico de memória do processo: {pico_memoria_mb():.1f} MB.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+# compilacao.py
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from data_loader import carregar_dados
+from parametros import CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS
+from perfil import fase
+
+DIRETORIO_COMPILADOS = os.path.join(".cache_grade", "catalogos")
+VERSAO_COMPILADO = 2
+
+# Módulos cujo código determina o conteúdo do artefato
+MODULOS_DO_CATALOGO = ("data_loader.py", "compilacao.py")
+
+
+def _sha256(caminho):
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _assinatura_codigo():
+    """
+    Hash do código que gera o catálogo: mudar o carregamento ('data_loader.py') ou a montagem do
+    artefato (este módulo) invalida os artefatos antigos.
+    """
+    h = hashlib.sha256(str(VERSAO_COMPILADO).encode())
+    diretorio_codigo = os.path.dirname(os.path.abspath(__file__))
+    for modulo in MODULOS_DO_CATALOGO:
+        with open(os.path.join(diretorio_codigo, modulo), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _descrever_fonte(caminho):
+    estado = os.stat(caminho)
+    return {"caminho": os.path.abspath(caminho), "tamanho": estado.st_size, "mtime_ns": estado.st_mtime_ns,
+            "sha256": _sha256(caminho)}
+
+
+def _fontes_validas(fontes, caminhos):
+    """
+    Confere se os arquivos de origem não mudaram desde a compilação. Tamanho e mtime iguais bastam;
+    se só o mtime mudou (ex: 'git checkout'), o conteúdo é comparado pelo SHA-256.
+    Retorna (valido, mtimes_atualizados).
+    """
+    atualizados = False
+    for fonte, caminho in zip(fontes, caminhos):
+        estado = os.stat(caminho)
+        if (estado.st_size, estado.st_mtime_ns) == (fonte["tamanho"], fonte["mtime_ns"]):
+            continue
+        if estado.st_size != fonte["tamanho"] or _sha256(caminho) != fonte["sha256"]:
+            return False, False
+        fonte["mtime_ns"] = estado.st_mtime_ns
+        atualizados = True
+    return True, atualizados
+
+
+def _internar(valor):
+    """Interna recursivamente os textos (IDs repetidos passam a ser um único objeto, gravado uma vez no pickle)."""
+    if isinstance(valor, str):
+        return sys.intern(valor)
+    if isinstance(valor, dict):
+        return {_internar(k): _internar(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_internar(v) for v in valor]
+    if isinstance(valor, tuple):
+        return tuple(_internar(v) for v in valor)
+    if isinstance(valor, frozenset):
+        return frozenset(_internar(v) for v in valor)
+    if isinstance(valor, set):
+        return {_internar(v) for v in valor}
+    return valor
+
+
+def _gravar_atomico(caminho, escrever):
+    """Grava em um arquivo temporário no mesmo diretório e o renomeia: leitores nunca veem um arquivo pela metade."""
+    with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(caminho), suffix=".tmp", delete=False) as f:
+        try:
+            escrever(f)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    os.replace(f.name, caminho)
+
+
+def diretorio_artefato(caminho_disciplinas, caminho_ofertas, diretorio=DIRETORIO_COMPILADOS):
+    """Diretório do artefato compilado de um par de arquivos de origem (pelos caminhos absolutos)."""
+    origem = "\n".join(os.path.abspath(c) for c in (caminho_disciplinas, caminho_ofertas))
+    return os.path.join(diretorio, hashlib.sha1(origem.encode("utf-8")).hexdigest()[:16])
+
+
+def compilar_catalogo(caminho_disciplinas, caminho_ofertas, diretorio=DIRETORIO_COMPILADOS, perfil=None):
+    """
+    Carrega os arquivos JSON com 'carregar_dados' e grava o resultado como artefato binário:
+
+    - dados.pickle: os dicionários e índices já montados (o que o modelo e a heurística leem),
+      com os IDs internados;
+    - fontes.json: tamanho, mtime e SHA-256 das origens e o hash do código, gravado por último
+      (sem ele, o artefato é considerado ausente).
+
+    Retorna os dados carregados.
+    """
+    fontes = [_descrever_fonte(caminho_disciplinas), _descrever_fonte(caminho_ofertas)]
+    dados = carregar_dados(caminho_disciplinas, caminho_ofertas, perfil=perfil)
+
+    with fase(perfil, "compilacao"):
+        destino = diretorio_artefato(caminho_disciplinas, caminho_ofertas, diretorio)
+        os.makedirs(destino, exist_ok=True)
+        caminho_fontes = os.path.join(destino, "fontes.json")
+        if os.path.exists(caminho_fontes):
+            os.remove(caminho_fontes)
+
+        internados = _internar(dados)
+        _gravar_atomico(os.path.join(destino, "dados.pickle"),
+                        lambda f: pickle.dump(internados, f, protocol=pickle.HIGHEST_PROTOCOL))
+        conteudo = json.dumps({"codigo": _assinatura_codigo(), "fontes": fontes}).encode("utf-8")
+        _gravar_atomico(caminho_fontes, lambda f: f.write(conteudo))
+    return dados
+
+
+def carregar_compilado(caminho_disciplinas, caminho_ofertas, diretorio=DIRETORIO_COMPILADOS):
+    """Lê o artefato compilado, se existir e ainda corresponder às origens e ao código; senão, retorna None."""
+    destino = diretorio_artefato(caminho_disciplinas, caminho_ofertas, diretorio)
+    caminho_fontes = os.path.join(destino, "fontes.json")
+    try:
+        with open(caminho_fontes, 'r', encoding='utf-8') as f:
+            registro = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if registro.get("codigo") != _assinatura_codigo():
+        return None
+    valido, atualizados = _fontes_validas(registro["fontes"], [caminho_disciplinas, caminho_ofertas])
+    if not valido:
+        return None
+    if atualizados:
+        conteudo = json.dumps(registro).encode("utf-8")
+        _gravar_atomico(caminho_fontes, lambda f: f.write(conteudo))
+
+    try:
+        with open(os.path.join(destino, "dados.pickle"), 'rb') as f:
+            dados = pickle.load(f)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return None
+    return dados
+
+
+def carregar_dados_compilados(caminho_disciplinas, caminho_ofertas, perfil=None, diretorio=DIRETORIO_COMPILADOS):
+    """
+    Equivalente a 'carregar_dados', mas usando o artefato compilado quando ele está em dia;
+    caso contrário, compila (uma vez) e grava o artefato para as próximas execuções.
+    """
+    with fase(perfil, "leitura_compilado"):
+        dados = carregar_compilado(caminho_disciplinas, caminho_ofertas, diretorio)
+    if dados is None:
+        return compilar_catalogo(caminho_disciplinas, caminho_ofertas, diretorio, perfil=perfil)
+    print(f"Considerando {len(dados['disciplinas'])} disciplinas com ofertas disponíveis (catálogo compilado)...")
+    if dados["eletivas_livres"]:
+        print(f"Eletivas livres modeladas por contador de blocos: {', '.join(sorted(dados['eletivas_livres']))}")
+    return dados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila 'disciplinas.json' + 'ofertas.json' em um catálogo binário.")
+    parser.add_argument("disciplinas", nargs="?", default=CAMINHO_DISCIPLINAS)
+    parser.add_argument("ofertas", nargs="?", default=CAMINHO_OFERTAS)
+    parser.add_argument("--diretorio", default=DIRETORIO_COMPILADOS)
+    args = parser.parse_args()
+
+    compilar_catalogo(args.disciplinas, args.ofertas, args.diretorio)
+
+    inicio = time.perf_counter()
+    carregar_dados(args.disciplinas, args.ofertas)
+    tempo_json = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    carregar_compilado(args.disciplinas, args.ofertas, args.diretorio)
+    tempo_compilado = time.perf_counter() - inicio
+
+    print(f"Artefato em '{diretorio_artefato(args.disciplinas, args.ofertas, args.diretorio)}'.")
+    print(f"Carga a partir do JSON: {tempo_json * 1000:.1f} ms; a partir do compilado: {tempo_compilado * 1000:.1f} ms.")
+
+if __name__ == '__main__':
+    main()
@@ -1,69 +1,468 @@
 # data_loader.py
 import json
+import re
+from math import comb
+from perfil import fase
 
-def carregar_dados(caminho_disciplinas, caminho_ofertas):
+# Blocos de aula padrão da semana (ex: "SEG-08-10"), os mesmos usados por 'gerarLivre.py'
+DIAS_SEMANA = ["SEG", "TER", "QUA", "QUI", "SEX"]
+HORARIOS_INICIO = [8, 10, 13, 15]
+BLOCOS_PADRAO = [f"{dia}-{inicio:02d}-{inicio + 2:02d}" for dia in DIAS_SEMANA for inicio in HORARIOS_INICIO]
+
+# Regras específicas de disciplinas: semestre mínimo em que podem ser cursadas.
+# Também podem ser declaradas em 'disciplinas.json' com o campo "semestre_minimo".
+SEMESTRE_MINIMO_POR_DISCIPLINA = {
+    "EEWU00": 6,  # O Estágio Obrigatório só pode ser cursado a partir do 6º semestre.
+}
+
+# Categorias de optativa: nome usado em 'creditos_minimos' e chave da lista de IDs em 'dados'
+CHAVES_CATEGORIAS = (("restrita", "restritas_ids"), ("condicionada", "condicionadas_ids"), ("livre", "livres_ids"))
+
+# Espaços e vírgulas entre os elementos de um array JSON (ver 'ler_ofertas')
+SEPARADORES_JSON = re.compile(r'[\s,]*')
+
+def carregar_dados(caminho_disciplinas, caminho_ofertas, perfil=None):
     """
     Carrega os dados dos arquivos JSON, categoriza as disciplinas e realiza o pré-processamento.
+    O arquivo de ofertas pode ser um array JSON ou JSON lines e é lido em fluxo (ver 'ler_ofertas').
+    'perfil' (ver 'perfil.py') mede cada etapa, se informado.
     Retorna um dicionário contendo todas as estruturas de dados necessárias.
     """
-    with open(caminho_disciplinas, 'r', encoding='utf-8') as f:
-        disciplinas_data = json.load(f)
-    with open(caminho_ofertas, 'r', encoding='utf-8') as f:
-        ofertas_data = json.load(f)
-
-    # --- MUDANÇA AQUI: Categorizar disciplinas antes de filtrar ---
-    obrigatorias_ids = []
-    restritas_ids = []
-    condicionadas_ids = []
-    livres_ids = []
-
-    for d in disciplinas_data:
-        tipo = d.get("tipo", "")
-        # Considera disciplinas de Períodos e Estágio/TCC como obrigatórias
-        if "Período" in tipo:
-            obrigatorias_ids.append(d["id"])
-        elif "Escolha Restrita" in tipo:
-            restritas_ids.append(d["id"])
-        elif "Escolha Condicionada" in tipo:
-            condicionadas_ids.append(d["id"])
-        # As disciplinas "ARTIFICIAL" que você criou caem aqui
-        elif "Livre Escolha" in tipo or d["id"].startswith("ARTIFICIAL"):
-            livres_ids.append(d["id"])
-
-    # Filtra as disciplinas para considerar apenas aquelas com ofertas
-    disciplinas_ofertadas_ids = {o['disciplina_id'] for o in ofertas_data}
-    disciplinas_filtradas = [d for d in disciplinas_data if d['id'] in disciplinas_ofertadas_ids]
-    disciplinas = {d['id']: d for d in disciplinas_filtradas}
-    print(f"Considerando {len(disciplinas)} disciplinas com ofertas disponíveis...")
-
-    # Mapeia turmas, horários e períodos
-    turmas_por_disciplina = {d_id: [] for d_id in disciplinas}
+    with fase(perfil, "leitura_json"):
+        with open(caminho_disciplinas, 'r', encoding='utf-8') as f:
+            disciplinas_data = json.load(f)
+        # As ofertas podem vir de um arquivo com a universidade inteira: só as do currículo ficam em memória
+        # (lidas em fluxo e indexadas à medida que chegam)
+        ofertas = indexar_ofertas(ler_ofertas(caminho_ofertas, {d['id'] for d in disciplinas_data}))
+
+    return montar_dados(disciplinas_data, ofertas, perfil=perfil)
+
+
+def indexar_ofertas(ofertas_data):
+    """
+    Indexa as ofertas (lista ou gerador, ver 'ler_ofertas') por disciplina e por turma.
+    Retorna turmas_por_disciplina, horarios_por_turma, periodos_por_turma, periodos_validos_por_disciplina
+    e turmas_duplicadas; o resultado pode ser compartilhado por vários currículos (ver 'montar_dados').
+    """
+    turmas_por_disciplina = {}
     horarios_por_turma = {}
+    periodos_por_turma = {}
     periodos_validos_por_disciplina = {}
+    turmas_duplicadas = []
 
     for oferta in ofertas_data:
         d_id = oferta['disciplina_id']
         t_id = oferta['turma_id']
-        
-        if d_id in turmas_por_disciplina:
-            turmas_por_disciplina[d_id].append(t_id)
-        
+
+        # Uma turma repetida no arquivo de ofertas é registrada uma única vez (e anotada para o validador)
+        if t_id in horarios_por_turma:
+            turmas_duplicadas.append(t_id)
+        else:
+            turmas_por_disciplina.setdefault(d_id, []).append(t_id)
+
         horarios_por_turma[t_id] = oferta.get('horario', [])
 
         if 'periodo' in oferta and oferta['periodo']:
             periodos = {int(p.strip()) for p in oferta['periodo'].split(',')}
+            periodos_por_turma[t_id] = frozenset(periodos)
             if d_id not in periodos_validos_por_disciplina:
                 periodos_validos_por_disciplina[d_id] = set()
             periodos_validos_por_disciplina[d_id].update(periodos)
-    
+
+    return {
+        "turmas_por_disciplina": turmas_por_disciplina,
+        "horarios_por_turma": horarios_por_turma,
+        "periodos_por_turma": periodos_por_turma,
+        "periodos_validos_por_disciplina": periodos_validos_por_disciplina,
+        "turmas_duplicadas": turmas_duplicadas,
+    }
+
+
+def montar_dados(disciplinas_data, ofertas, blocos=None, perfil=None):
+    """
+    Monta os dados de um currículo ('disciplinas.json' já lido) sobre as ofertas de 'indexar_ofertas'.
+
+    As listas de turmas, os horários e os períodos das ofertas são referenciados, não copiados. Se
+    'blocos' (de 'indexar_blocos', sobre todas as turmas ofertadas) for informado, o índice de horários
+    também é compartilhado, sem reindexar as turmas do currículo.
+    """
+    with fase(perfil, "categorizacao"):
+        # --- MUDANÇA AQUI: Categorizar disciplinas antes de filtrar ---
+        obrigatorias_ids = []
+        restritas_ids = []
+        condicionadas_ids = []
+        livres_ids = []
+
+        for d in disciplinas_data:
+            tipo = d.get("tipo", "")
+            # Considera disciplinas de Períodos e Estágio/TCC como obrigatórias
+            if "Período" in tipo:
+                obrigatorias_ids.append(d["id"])
+            elif "Escolha Restrita" in tipo:
+                restritas_ids.append(d["id"])
+            elif "Escolha Condicionada" in tipo:
+                condicionadas_ids.append(d["id"])
+            # As disciplinas "ARTIFICIAL" que você criou caem aqui
+            elif "Livre Escolha" in tipo or d["id"].startswith("ARTIFICIAL"):
+                livres_ids.append(d["id"])
+
+        # Filtra as disciplinas para considerar apenas aquelas com ofertas
+        # (eletivas livres declaradas com "blocos_livres" não precisam de turmas)
+        turmas_ofertadas = ofertas["turmas_por_disciplina"]
+        disciplinas_filtradas = [d for d in disciplinas_data if d['id'] in turmas_ofertadas or d.get('blocos_livres')]
+        disciplinas = {d['id']: d for d in disciplinas_filtradas}
+        # Guardadas para o validador: uma obrigatória sem oferta simplesmente some do modelo
+        disciplinas_sem_oferta = {d['id']: d.get("tipo", "") for d in disciplinas_data if d['id'] not in disciplinas}
+        print(f"Considerando {len(disciplinas)} disciplinas com ofertas disponíveis...")
+
+    with fase(perfil, "turmas_e_periodos"):
+        # Mapeia turmas, horários e períodos do currículo (as listas e conjuntos são os das ofertas)
+        horarios_por_turma = ofertas["horarios_por_turma"]
+        turmas_por_disciplina = {d_id: turmas_ofertadas.get(d_id, []) for d_id in disciplinas}
+        periodos_validos_por_disciplina = {
+            d_id: periodos for d_id, periodos in ofertas["periodos_validos_por_disciplina"].items() if d_id in disciplinas
+        }
+        turmas_do_curriculo = {t_id for turmas in turmas_por_disciplina.values() for t_id in turmas}
+        turmas_duplicadas = [t_id for t_id in ofertas["turmas_duplicadas"] if t_id in turmas_do_curriculo]
+
+    with fase(perfil, "eletivas_livres"):
+        # Eletivas livres: declaradas com "blocos_livres" ou geradas por 'gerarLivre.py'
+        # (todas as combinações de N blocos padrão) viram um único contador de blocos por semestre.
+        eletivas_livres = {}
+        turmas_livres_por_horarios = {}
+        for d_id, disc in disciplinas.items():
+            num_blocos = disc.get('blocos_livres') or detectar_blocos_livres(turmas_por_disciplina[d_id], horarios_por_turma)
+            if not num_blocos:
+                continue
+            eletivas_livres[d_id] = int(num_blocos)
+            turmas_livres_por_horarios[d_id] = {frozenset(horarios_por_turma[t_id]): t_id for t_id in turmas_por_disciplina[d_id]}
+            turmas_por_disciplina[d_id] = []
+            if disc.get('periodo') and d_id not in periodos_validos_por_disciplina:
+                periodos_validos_por_disciplina[d_id] = {int(p.strip()) for p in disc['periodo'].split(',')}
+        if eletivas_livres:
+            print(f"Eletivas livres modeladas por contador de blocos: {', '.join(sorted(eletivas_livres))}")
+
+    with fase(perfil, "indexacao_horarios"):
+        indices = indexar_horarios(turmas_por_disciplina, horarios_por_turma) if blocos is None else blocos
+
     return {
         "disciplinas": disciplinas,
         "turmas_por_disciplina": turmas_por_disciplina,
         "horarios_por_turma": horarios_por_turma,
+        "periodos_por_turma": ofertas["periodos_por_turma"],
         "periodos_validos_por_disciplina": periodos_validos_por_disciplina,
+        "eletivas_livres": eletivas_livres,
+        "turmas_livres_por_horarios": turmas_livres_por_horarios,
+        "turmas_duplicadas": turmas_duplicadas,
+        "disciplinas_sem_oferta": disciplinas_sem_oferta,
+        **indices,
         # --- NOVO: Retorna as listas de IDs categorizados ---
         "obrigatorias_ids": [d_id for d_id in obrigatorias_ids if d_id in disciplinas],
         "restritas_ids": [d_id for d_id in restritas_ids if d_id in disciplinas],
         "condicionadas_ids": [d_id for d_id in condicionadas_ids if d_id in disciplinas],
         "livres_ids": [d_id for d_id in livres_ids if d_id in disciplinas]
-    }
\ No newline at end of file
+    }
+
+
+def ler_ofertas(caminho_ofertas, disciplinas_ids=None, tamanho_bloco=1 << 16):
+    """
+    Lê as ofertas incrementalmente, sem carregar o arquivo inteiro em memória. Aceita um array JSON
+    (como o gerado pelos scrapers) ou JSON lines (um objeto por linha).
+    Se 'disciplinas_ids' for informado, só gera as ofertas dessas disciplinas: a memória usada é
+    proporcional ao subconjunto relevante, não ao tamanho do arquivo.
+    """
+    with open(caminho_ofertas, 'r', encoding='utf-8') as f:
+        ofertas = _objetos_array_json(f, tamanho_bloco) if _abre_array_json(f) else _objetos_json_lines(f)
+        for oferta in ofertas:
+            if disciplinas_ids is None or oferta.get('disciplina_id') in disciplinas_ids:
+                yield oferta
+
+
+def _abre_array_json(f):
+    """Indica se o arquivo começa com '[' (array JSON), deixando a leitura logo após ele; senão, volta ao início."""
+    while True:
+        c = f.read(1)
+        if not c.isspace():
+            break
+    if c == '[':
+        return True
+    f.seek(0)
+    return False
+
+
+def _objetos_json_lines(f):
+    for numero, linha in enumerate(f, start=1):
+        if linha.strip():
+            try:
+                yield json.loads(linha)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Linha {numero} inválida em '{f.name}': {e}") from e
+
+
+def _objetos_array_json(f, tamanho_bloco):
+    """
+    Gera os elementos de um array JSON lendo o arquivo em blocos: cada elemento é decodificado com
+    'raw_decode' assim que estiver completo no buffer, que guarda só o bloco atual e o elemento em curso.
+    """
+    decodificador = json.JSONDecoder()
+    buffer, pos, fim_arquivo = "", 0, False
+    while True:
+        # Pula espaços e a vírgula entre elementos, lendo o próximo bloco quando o buffer acaba
+        while True:
+            pos = SEPARADORES_JSON.match(buffer, pos).end()
+            if pos < len(buffer) or fim_arquivo:
+                break
+            buffer, pos = f.read(tamanho_bloco), 0
+            fim_arquivo = not buffer
+        if pos >= len(buffer):
+            raise ValueError(f"Array JSON não terminado em '{f.name}'.")
+        if buffer[pos] == ']':
+            return
+
+        try:
+            objeto, pos = decodificador.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if fim_arquivo:
+                raise
+            # Elemento incompleto: junta o próximo bloco e tenta de novo
+            bloco = f.read(tamanho_bloco)
+            fim_arquivo = not bloco
+            buffer, pos = buffer[pos:] + bloco, 0
+            continue
+        yield objeto
+
+
+def indexar_horarios(turmas_por_disciplina, horarios_por_turma):
+    """
+    Converte os horários em texto (ex: "SEG-08-10") em índices inteiros fixos, uma única vez
+    ('indexar_blocos' sobre as turmas de 'turmas_por_disciplina'). Conflitos entre turmas são testados
+    pelas bitmasks ('mascara_por_turma[t1] & mascara_por_turma[t2]'), sem matriz turmas x turmas.
+    """
+    turmas = [t_id for turmas_d in turmas_por_disciplina.values() for t_id in turmas_d]
+    return indexar_blocos(turmas, horarios_por_turma)
+
+
+def indexar_blocos(turmas, horarios_por_turma):
+    """
+    - horarios / indice_horario: os blocos padrão ocupam os índices 0..19, na ordem de BLOCOS_PADRAO;
+      os demais horários recebem os índices seguintes, na ordem em que aparecem.
+    - horarios_idx_por_turma / mascara_por_turma: índices e bitmask dos horários de cada turma.
+    - partes_horario: (dia, faixa) de cada horário, ou None se o texto não estiver no formato DIA-HH-HH.
+    """
+    horarios = list(BLOCOS_PADRAO)
+    indice_horario = {h: i for i, h in enumerate(horarios)}
+    for t_id in turmas:
+        for h in horarios_por_turma.get(t_id, []):
+            if h not in indice_horario:
+                indice_horario[h] = len(horarios)
+                horarios.append(h)
+
+    partes_horario = []
+    for h in horarios:
+        partes = h.split('-')
+        partes_horario.append((partes[0], f"{partes[1]}-{partes[2]}") if len(partes) == 3 else None)
+
+    horarios_idx_por_turma = {t_id: tuple(sorted({indice_horario[h] for h in horarios_por_turma.get(t_id, [])})) for t_id in turmas}
+    mascara_por_turma = {t_id: sum(1 << i for i in idx) for t_id, idx in horarios_idx_por_turma.items()}
+
+    return {
+        "horarios": horarios,
+        "indice_horario": indice_horario,
+        "partes_horario": partes_horario,
+        "horarios_idx_por_turma": horarios_idx_por_turma,
+        "mascara_por_turma": mascara_por_turma,
+    }
+
+
+def detectar_blocos_livres(turmas, horarios_por_turma):
+    """
+    Reconhece uma disciplina cujas turmas são exatamente todas as combinações de N blocos padrão
+    (como as geradas por 'gerarLivre.py') e retorna N; caso contrário, retorna None.
+    """
+    if not turmas:
+        return None
+    conjuntos = {frozenset(horarios_por_turma.get(t_id, [])) for t_id in turmas}
+    tamanhos = {len(c) for c in conjuntos}
+    if len(tamanhos) != 1:
+        return None
+    num_blocos = tamanhos.pop()
+    if num_blocos == 0 or len(conjuntos) != comb(len(BLOCOS_PADRAO), num_blocos):
+        return None
+    if any(not c.issubset(BLOCOS_PADRAO) for c in conjuntos):
+        return None
+    return num_blocos
+
+
+def reduzir_turmas(dados):
+    """
+    Pré-processamento (presolve) das turmas, executado após 'carregar_dados'.
+
+    - Turmas da mesma disciplina com o mesmo conjunto de horários e os mesmos períodos são equivalentes:
+      apenas uma representante vai para o modelo, e 'turmas_equivalentes' guarda todas as turmas reais
+      que ela representa.
+    - Uma turma cujos horários contêm estritamente os de outra turma da mesma disciplina e dos mesmos
+      períodos é dominada (qualquer grade que a use continua válida trocando-a pela outra) e é descartada.
+
+    Retorna um novo dicionário de dados; o original não é alterado.
+    """
+    mascara_por_turma = dados["mascara_por_turma"]
+    periodos_por_turma = dados["periodos_por_turma"]
+
+    turmas_por_disciplina = {}
+    turmas_equivalentes = {}
+    turmas_dominadas = 0
+
+    for d_id, turmas in dados["turmas_por_disciplina"].items():
+        # 1. Agrupa turmas idênticas (mesmos horários e mesmos períodos)
+        grupos = {}
+        for t_id in turmas:
+            chave = (mascara_por_turma[t_id], periodos_por_turma.get(t_id))
+            grupos.setdefault(chave, []).append(t_id)
+
+        # 2. Descarta as representantes cujos horários são superconjunto estrito de outra do mesmo período.
+        #    Ordenar por número de horários garante que só turmas menores sejam consultadas.
+        chaves = sorted(grupos, key=lambda chave: bin(chave[0]).count("1"))
+        mantidas = []
+        for mascara, periodos in chaves:
+            if any(periodos == p and m != mascara and m & mascara == m for m, p in mantidas):
+                turmas_dominadas += len(grupos[(mascara, periodos)])
+                continue
+            mantidas.append((mascara, periodos))
+
+        turmas_por_disciplina[d_id] = []
+        for chave in mantidas:
+            representante = grupos[chave][0]
+            turmas_por_disciplina[d_id].append(representante)
+            turmas_equivalentes[representante] = grupos[chave]
+
+    total_antes = sum(len(t) for t in dados["turmas_por_disciplina"].values())
+    total_depois = sum(len(t) for t in turmas_por_disciplina.values())
+    print(f"Pré-processamento: {total_antes} -> {total_depois} turmas "
+          f"({total_antes - total_depois - turmas_dominadas} equivalentes unificadas, {turmas_dominadas} dominadas descartadas).")
+
+    return {
+        **dados,
+        "turmas_por_disciplina": turmas_por_disciplina,
+        "turmas_equivalentes": turmas_equivalentes,
+    }
+
+
+def disciplinas_cursadas_obrigatoriamente(dados):
+    """
+    Obrigatórias e todo pré-requisito de alguma disciplina do currículo: no modelo, um pré-requisito
+    não cursado exigiria 'semestre' maior que NUM_SEMESTRES + 1 para quem depende dele.
+    """
+    disciplinas = dados["disciplinas"]
+    prerequisitos = {p for disc in disciplinas.values() for p in disc.get('prerequisitos', []) if p in disciplinas}
+    return set(dados["obrigatorias_ids"]) | prerequisitos
+
+
+def classes_de_simetria(dados):
+    """
+    Agrupa as disciplinas intercambiáveis: trocar uma pela outra em qualquer grade dá outra grade válida,
+    com os mesmos créditos por semestre e os mesmos horários ocupados. São as da mesma categoria, com os
+    mesmos créditos, pré-requisitos, dependentes, períodos de oferta e semestre mínimo e, ou o mesmo número
+    de blocos (eletivas livres, ex: ARTIFICIAL01/ARTIFICIAL02), ou turmas com os mesmos horários e períodos.
+
+    Retorna uma lista de classes com pelo menos duas disciplinas; cada classe é uma lista de pares
+    (d_id, turmas), em ordem de ID, com as turmas em uma ordem canônica (por horários e períodos) em que a
+    k-ésima turma de uma disciplina corresponde à k-ésima turma das outras.
+    Turmas idênticas da mesma disciplina já são unificadas por 'reduzir_turmas'.
+    """
+    disciplinas = dados["disciplinas"]
+    mascara_por_turma = dados["mascara_por_turma"]
+    periodos_por_turma = dados["periodos_por_turma"]
+
+    categoria_por_disciplina = {}
+    for chave in ["obrigatorias_ids"] + [chave for _, chave in CHAVES_CATEGORIAS]:
+        for d_id in dados[chave]:
+            categoria_por_disciplina.setdefault(d_id, chave)
+
+    sucessores = {d_id: set() for d_id in disciplinas}
+    for d_id, disc in disciplinas.items():
+        for p in disc.get('prerequisitos', []):
+            if p in disciplinas:
+                sucessores[p].add(d_id)
+
+    def chave_turma(t_id):
+        return mascara_por_turma[t_id], tuple(sorted(periodos_por_turma.get(t_id) or ()))
+
+    grupos = {}
+    for d_id in sorted(disciplinas):
+        disc = disciplinas[d_id]
+        turmas = sorted(dados["turmas_por_disciplina"].get(d_id, []), key=chave_turma)
+        blocos = dados["eletivas_livres"].get(d_id)
+        if not turmas and blocos is None:
+            continue  # sem turmas, a disciplina não tem variáveis no modelo
+        assinatura = (
+            categoria_por_disciplina.get(d_id),
+            int(disc['creditos']),
+            frozenset(p for p in disc.get('prerequisitos', []) if p in disciplinas),
+            frozenset(sucessores[d_id]),
+            frozenset(dados["periodos_validos_por_disciplina"].get(d_id, {1, 2})),
+            disc.get('semestre_minimo') or SEMESTRE_MINIMO_POR_DISCIPLINA.get(d_id, 1),
+            blocos,
+            tuple(chave_turma(t_id) for t_id in turmas),
+        )
+        grupos.setdefault(assinatura, []).append((d_id, turmas))
+
+    return [classe for classe in grupos.values() if len(classe) > 1]
+
+
+def calcular_janelas(dados, NUM_SEMESTRES):
+    """
+    Calcula, para cada disciplina, a janela [inicio, fim] de semestres em que ela pode ser cursada.
+
+    - inicio: o primeiro semestre com paridade de oferta válida que respeita a cadeia de pré-requisitos
+      (cada pré-requisito em um semestre anterior) e o semestre mínimo da disciplina, se houver.
+    - fim: o último semestre com paridade válida que ainda deixa espaço, dentro do horizonte, para as
+      disciplinas que dependem dela e que obrigatoriamente serão cursadas (obrigatórias e pré-requisitos).
+
+    Uma janela vazia (inicio > fim) indica que a disciplina não cabe no horizonte; disciplinas
+    envolvidas em ciclos de pré-requisitos também recebem janela vazia.
+    """
+    disciplinas = dados["disciplinas"]
+    periodos_validos_por_disciplina = dados["periodos_validos_por_disciplina"]
+
+    def semestre_permitido(d_id, s):
+        periodos_validos = periodos_validos_por_disciplina.get(d_id, {1, 2})
+        return (1 if s % 2 != 0 else 2) in periodos_validos
+
+    prerequisitos = {
+        d_id: [p for p in disc.get('prerequisitos', []) if p in disciplinas]
+        for d_id, disc in disciplinas.items()
+    }
+    sucessores = {d_id: [] for d_id in disciplinas}
+    for d_id, prereqs in prerequisitos.items():
+        for p in prereqs:
+            sucessores[p].append(d_id)
+
+    cursadas_obrigatoriamente = disciplinas_cursadas_obrigatoriamente(dados)
+
+    # Ordenação topológica iterativa (Kahn)
+    pendentes = {d_id: len(prereqs) for d_id, prereqs in prerequisitos.items()}
+    ordem = [d_id for d_id, n in pendentes.items() if n == 0]
+    i = 0
+    while i < len(ordem):
+        for c in sucessores[ordem[i]]:
+            pendentes[c] -= 1
+            if pendentes[c] == 0:
+                ordem.append(c)
+        i += 1
+
+    inicio = {}
+    for d_id in ordem:
+        semestre_minimo = disciplinas[d_id].get('semestre_minimo') or SEMESTRE_MINIMO_POR_DISCIPLINA.get(d_id, 1)
+        s = max([semestre_minimo] + [inicio[p] + 1 for p in prerequisitos[d_id]])
+        while s <= NUM_SEMESTRES and not semestre_permitido(d_id, s):
+            s += 1
+        inicio[d_id] = s
+
+    fim = {}
+    for d_id in reversed(ordem):
+        s = min([NUM_SEMESTRES] + [fim[c] - 1 for c in sucessores[d_id] if c in cursadas_obrigatoriamente])
+        while s >= 1 and not semestre_permitido(d_id, s):
+            s -= 1
+        fim[d_id] = s
+
+    return {d_id: (inicio.get(d_id, NUM_SEMESTRES + 1), fim.get(d_id, 0)) for d_id in disciplinas}
@@ -0,0 +1,69 @@
+# diagnostico.py
+from ortools.sat.python import cp_model
+from data_loader import SEMESTRE_MINIMO_POR_DISCIPLINA
+from optimizer import ConfiguracaoSolver, construir_modelo
+
+
+def descrever_suposicao(dados, chave, creditos_minimos, CREDITOS_MAXIMOS_POR_SEMESTRE):
+    """Texto legível de uma suposição (grupo, identificador) do modelo de diagnóstico."""
+    grupo, identificador = chave
+    disciplinas = dados["disciplinas"]
+    if grupo == "obrigatoria":
+        return f"A disciplina obrigatória {identificador} ({disciplinas[identificador]['nome']}) precisa ser cursada"
+    if grupo == "creditos_minimos":
+        return f"Mínimo de {creditos_minimos[identificador]} créditos em optativas de escolha {identificador}"
+    if grupo == "limite_creditos":
+        return f"Limite de {CREDITOS_MAXIMOS_POR_SEMESTRE} créditos no semestre {identificador}"
+    if grupo == "paridade":
+        periodos = sorted(dados["periodos_validos_por_disciplina"][identificador])
+        return f"{identificador} ({disciplinas[identificador]['nome']}) só é oferecida no período {', '.join(map(str, periodos))}"
+    if grupo == "semestre_minimo":
+        semestre_minimo = disciplinas[identificador].get('semestre_minimo') or SEMESTRE_MINIMO_POR_DISCIPLINA[identificador]
+        return f"{identificador} ({disciplinas[identificador]['nome']}) só pode ser cursada a partir do {semestre_minimo}º semestre"
+    return f"{grupo}: {identificador}"
+
+
+def explicar_infactibilidade(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, tempo_por_verificacao=10.0):
+    """
+    Encontra um subconjunto mínimo de grupos de restrições que, juntos, tornam o modelo infactível.
+
+    Cada grupo é condicionado a um literal de suposição (ver 'construir_modelo' com diagnostico=True).
+    A primeira resolução devolve um conjunto suficiente pelo 'SufficientAssumptionsForInfeasibility' do
+    CP-SAT; em seguida, cada suposição é retirada por vez e só volta se o restante deixar de ser infactível
+    (minimização por remoção, reaproveitando o novo núcleo a cada passo).
+
+    Retorna uma lista de (chave, descrição); vazia se a infactibilidade não depende de nenhum grupo
+    (ex: pré-requisitos e conflitos de horário por si sós), ou None se o modelo não for provado infactível.
+    """
+    modelo = construir_modelo(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE,
+                              objetivo=False, diagnostico=True)
+    model = modelo["model"]
+    suposicoes = modelo["suposicoes"]
+    chave_por_indice = {literal.Index(): chave for chave, literal in suposicoes.items()}
+    # Um único worker: é a busca sequencial que preenche o núcleo de suposições
+    configuracao = ConfiguracaoSolver(num_workers=1, tempo_limite=tempo_por_verificacao)
+
+    def verificar(chaves):
+        model.ClearAssumptions()
+        model.AddAssumptions([suposicoes[chave] for chave in chaves])
+        solver = cp_model.CpSolver()
+        configuracao.aplicar(solver)
+        status = solver.Solve(model)
+        if status != cp_model.INFEASIBLE:
+            return status, None
+        nucleo = {chave_por_indice[i] for i in solver.SufficientAssumptionsForInfeasibility()}
+        return status, [chave for chave in chaves if chave in nucleo]
+
+    status, nucleo = verificar(list(suposicoes))
+    if status != cp_model.INFEASIBLE:
+        return None
+
+    i = 0
+    while i < len(nucleo):
+        status, menor = verificar(nucleo[:i] + nucleo[i + 1:])
+        if status == cp_model.INFEASIBLE:
+            nucleo = menor  # a suposição i não é necessária (e o novo núcleo pode ser ainda menor)
+        else:
+            i += 1  # necessária (ou não foi possível provar o contrário dentro do tempo)
+
+    return [(chave, descrever_suposicao(dados, chave, creditos_minimos, CREDITOS_MAXIMOS_POR_SEMESTRE)) for chave in nucleo]
@@ -0,0 +1,106 @@
+# gerador_sintetico.py
+import argparse
+import json
+import os
+import random
+
+from data_loader import BLOCOS_PADRAO as BLOCOS_DE_AULA
+
+TIPO_RESTRITA = "Disciplinas Optativas (Escolha Restrita)"
+TIPO_CONDICIONADA = "Disciplinas Optativas (Escolha Condicionada)"
+TIPO_LIVRE = "Disciplinas Optativas (Livre Escolha)"
+
+
+def gerar_curriculo(num_disciplinas, turmas_por_disciplina=3, profundidade_prerequisitos=6,
+                    proporcao_paridade=0.2, densidade_horarios=0.1, num_obrigatorias=None, semente=0):
+    """
+    Gera um par (disciplinas, ofertas) sintético no mesmo formato de 'disciplinas.json' e 'ofertas.json'.
+
+    - turmas_por_disciplina: número médio de turmas por disciplina (mínimo 1).
+    - profundidade_prerequisitos: número de níveis da cadeia de pré-requisitos das obrigatórias.
+    - proporcao_paridade: fração das turmas oferecidas em apenas um período ("1" ou "2").
+    - densidade_horarios: fração média dos 20 blocos semanais ocupada por uma turma.
+    - num_obrigatorias: quantidade de disciplinas obrigatórias (padrão: 30%, limitado a 40, como no currículo real).
+    """
+    rng = random.Random(semente)
+    if num_obrigatorias is None:
+        num_obrigatorias = min(40, int(0.3 * num_disciplinas))
+
+    # Distribui as disciplinas em níveis. As obrigatórias formam a cadeia de pré-requisitos (cada uma depende
+    # do nível imediatamente anterior, garantindo 'profundidade_prerequisitos' níveis); as optativas dependem
+    # apenas de obrigatórias, como no currículo real (um pré-requisito não cursado tornaria o modelo infactível).
+    obrigatorias_por_nivel = [[] for _ in range(profundidade_prerequisitos)]
+    disciplinas = []
+    for i in range(num_disciplinas):
+        d_id = f"SIN{i:05d}"
+        prerequisitos = []
+        if i < num_obrigatorias:
+            nivel = i % profundidade_prerequisitos
+            candidatos = obrigatorias_por_nivel[nivel - 1] if nivel > 0 else []
+            tipo = f"{nivel + 1}º Período"
+        else:
+            nivel = rng.randrange(profundidade_prerequisitos)
+            candidatos = [p for n in range(nivel) for p in obrigatorias_por_nivel[n]]
+            tipo = rng.choices([TIPO_RESTRITA, TIPO_CONDICIONADA, TIPO_LIVRE], weights=[3, 6, 1])[0]
+        if candidatos:
+            prerequisitos = sorted(rng.sample(candidatos, min(len(candidatos), rng.choice([1, 1, 2]))))
+
+        disciplinas.append({
+            "id": d_id,
+            "nome": f"Disciplina Sintética {i}",
+            "creditos": float(rng.choice([2, 4, 4, 4, 5, 6])),
+            "prerequisitos": prerequisitos,
+            "tipo": tipo
+        })
+        if i < num_obrigatorias:
+            obrigatorias_por_nivel[nivel].append(d_id)
+
+    blocos_medios = max(1, round(densidade_horarios * len(BLOCOS_DE_AULA)))
+    ofertas = []
+    for d in disciplinas:
+        num_turmas = max(1, round(rng.gauss(turmas_por_disciplina, turmas_por_disciplina / 3)))
+        if rng.random() < proporcao_paridade:
+            periodo = rng.choice(["1", "2"])
+        else:
+            periodo = "1,2"
+        for t in range(num_turmas):
+            num_blocos = min(len(BLOCOS_DE_AULA), max(1, blocos_medios + rng.choice([-1, 0, 0, 1])))
+            ofertas.append({
+                "disciplina_id": d["id"],
+                "turma_id": f"{d['id']}T{t + 1}",
+                "horario": sorted(rng.sample(BLOCOS_DE_AULA, num_blocos), key=BLOCOS_DE_AULA.index),
+                "periodo": periodo
+            })
+
+    return disciplinas, ofertas
+
+
+def salvar_curriculo(disciplinas, ofertas, diretorio):
+    """Salva o par gerado como 'disciplinas.json' e 'ofertas.json' em 'diretorio'."""
+    os.makedirs(diretorio, exist_ok=True)
+    caminho_disciplinas = os.path.join(diretorio, "disciplinas.json")
+    caminho_ofertas = os.path.join(diretorio, "ofertas.json")
+    with open(caminho_disciplinas, 'w', encoding='utf-8') as f:
+        json.dump(disciplinas, f, ensure_ascii=False, indent=2)
+    with open(caminho_ofertas, 'w', encoding='utf-8') as f:
+        json.dump(ofertas, f, ensure_ascii=False, indent=2)
+    return caminho_disciplinas, caminho_ofertas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera um currículo sintético (disciplinas.json + ofertas.json).")
+    parser.add_argument("diretorio", help="Diretório de saída")
+    parser.add_argument("--disciplinas", type=int, default=159)
+    parser.add_argument("--turmas", type=float, default=3, help="Número médio de turmas por disciplina")
+    parser.add_argument("--profundidade", type=int, default=6, help="Níveis da cadeia de pré-requisitos")
+    parser.add_argument("--paridade", type=float, default=0.2, help="Fração de disciplinas oferecidas em um só período")
+    parser.add_argument("--densidade", type=float, default=0.1, help="Fração dos blocos semanais ocupada por turma")
+    parser.add_argument("--obrigatorias", type=int, default=None)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    disciplinas, ofertas = gerar_curriculo(
+        args.disciplinas, args.turmas, args.profundidade, args.paridade, args.densidade, args.obrigatorias, args.semente
+    )
+    salvar_curriculo(disciplinas, ofertas, args.diretorio)
+    print(f"Gerado: {len(disciplinas)} disciplinas e {len(ofertas)} turmas em '{args.diretorio}'.")
@@ -0,0 +1,128 @@
+# heuristica.py
+from ortools.sat.python import cp_model
+from data_loader import BLOCOS_PADRAO, CHAVES_CATEGORIAS, calcular_janelas, disciplinas_cursadas_obrigatoriamente
+from limites import limite_inferior_semestres
+from optimizer import formatar_grade
+
+MASCARA_PADRAO = (1 << len(BLOCOS_PADRAO)) - 1  # os blocos padrão são os índices 0..19
+
+
+def selecionar_disciplinas(dados, creditos_minimos, janelas):
+    """
+    Escolhe o conjunto de disciplinas a cursar: as que precisam ser cursadas e, para cada categoria
+    de optativa, as mais cedo disponíveis (e de mais créditos) até completar o mínimo exigido.
+    """
+    disciplinas = dados["disciplinas"]
+    selecionadas = disciplinas_cursadas_obrigatoriamente(dados)
+
+    for categoria, chave in CHAVES_CATEGORIAS:
+        faltam = creditos_minimos[categoria] - sum(int(disciplinas[d_id]['creditos']) for d_id in dados[chave] if d_id in selecionadas)
+        candidatas = sorted(
+            (d_id for d_id in dados[chave] if d_id not in selecionadas and janelas[d_id][0] <= janelas[d_id][1]),
+            key=lambda d_id: (janelas[d_id][0], -disciplinas[d_id]['creditos'])
+        )
+        for d_id in candidatas:
+            if faltam <= 0:
+                break
+            selecionadas.add(d_id)
+            faltam -= int(disciplinas[d_id]['creditos'])
+
+    return selecionadas
+
+
+def construir_grade_gulosa(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE):
+    """
+    Heurística construtiva: tenta alocar tudo em horizontes crescentes, do limite inferior até NUM_SEMESTRES.
+    Horizontes menores apertam as janelas, o que coloca antes as disciplinas com menos folga.
+    Retorna o primeiro plano {d_id: (semestre, t_id)} completo, ou None se nenhum horizonte der certo.
+    """
+    limite_inferior = limite_inferior_semestres(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+    for horizonte in range(limite_inferior, NUM_SEMESTRES + 1):
+        plano = alocar_gulosamente(dados, creditos_minimos, horizonte, CREDITOS_MAXIMOS_POR_SEMESTRE)
+        if plano is not None:
+            return plano
+    return None
+
+
+def alocar_gulosamente(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE):
+    """
+    List scheduling: preenche os semestres em ordem, colocando primeiro as disciplinas com a maior
+    cadeia de dependentes pela frente (e, no empate, o menor prazo), com turmas sem conflito de horário
+    e respeitando o limite de créditos, as janelas de semestre e as eletivas livres.
+    Retorna um plano {d_id: (semestre, t_id)} completo, ou None se não conseguir alocar tudo.
+    """
+    disciplinas = dados["disciplinas"]
+    periodos_validos_por_disciplina = dados["periodos_validos_por_disciplina"]
+    mascara_por_turma = dados["mascara_por_turma"]
+    eletivas_livres = dados["eletivas_livres"]
+
+    janelas = calcular_janelas(dados, NUM_SEMESTRES)
+    selecionadas = selecionar_disciplinas(dados, creditos_minimos, janelas)
+    prerequisitos = {
+        d_id: [p for p in disciplinas[d_id].get('prerequisitos', []) if p in disciplinas]
+        for d_id in selecionadas
+    }
+
+    # Prioridade: comprimento da maior cadeia de dependentes selecionados (incluindo a própria disciplina).
+    # Processar em ordem decrescente de início de janela garante que os dependentes venham antes.
+    cadeia = {}
+    for d_id in sorted(selecionadas, key=lambda d_id: -janelas[d_id][0]):
+        cadeia.setdefault(d_id, 1)
+        for p in prerequisitos[d_id]:
+            if p in selecionadas:
+                cadeia[p] = max(cadeia.get(p, 1), cadeia[d_id] + 1)
+
+    plano = {}
+    for s in range(1, NUM_SEMESTRES + 1):
+        paridade = 1 if s % 2 != 0 else 2
+        candidatas = [
+            d_id for d_id in selecionadas
+            if d_id not in plano
+            and janelas[d_id][0] <= s <= janelas[d_id][1]
+            and paridade in periodos_validos_por_disciplina.get(d_id, {1, 2})
+            and all(p in plano and plano[p][0] < s for p in prerequisitos[d_id])
+        ]
+        candidatas.sort(key=lambda d_id: (-cadeia[d_id], janelas[d_id][1], -disciplinas[d_id]['creditos'], d_id))
+
+        mascara = 0
+        creditos = 0
+        blocos_reservados = 0  # blocos padrão prometidos às eletivas livres do semestre
+        for d_id in candidatas:
+            cred = int(disciplinas[d_id]['creditos'])
+            if creditos + cred > CREDITOS_MAXIMOS_POR_SEMESTRE:
+                continue
+            blocos_livres = len(BLOCOS_PADRAO) - bin(mascara & MASCARA_PADRAO).count("1")
+
+            if d_id in eletivas_livres:
+                if blocos_livres - blocos_reservados >= eletivas_livres[d_id]:
+                    blocos_reservados += eletivas_livres[d_id]
+                    plano[d_id] = (s, None)
+                    creditos += cred
+                continue
+
+            for t_id in dados["turmas_por_disciplina"][d_id]:
+                m = mascara_por_turma[t_id]
+                if m & mascara:
+                    continue
+                if blocos_livres - bin(m & MASCARA_PADRAO).count("1") < blocos_reservados:
+                    continue
+                plano[d_id] = (s, t_id)
+                mascara |= m
+                creditos += cred
+                break
+
+    if len(plano) < len(selecionadas):
+        return None
+    return plano
+
+
+def resolver_rapido(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE):
+    """
+    Modo rápido: usa apenas a heurística gulosa (milissegundos, sem garantia de otimalidade).
+    Retorna os resultados no mesmo formato de 'resolver_grade'.
+    """
+    plano = construir_grade_gulosa(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+    if plano is None:
+        return None, None, cp_model.UNKNOWN, None
+    grade, creditos_por_semestre = formatar_grade(dados, plano, NUM_SEMESTRES)
+    return grade, creditos_por_semestre, cp_model.FEASIBLE, float(max(s for s, _ in plano.values()))
@@ -0,0 +1,37 @@
+# limites.py
+import math
+from data_loader import CHAVES_CATEGORIAS, calcular_janelas, disciplinas_cursadas_obrigatoriamente
+
+def limite_caminho_critico(dados, NUM_SEMESTRES_MAX):
+    """
+    Limite pela cadeia de pré-requisitos: o maior início de janela (já ajustado à paridade de oferta
+    e aos semestres mínimos) entre as disciplinas que precisam ser cursadas.
+    """
+    janelas = calcular_janelas(dados, NUM_SEMESTRES_MAX)
+    return max((janelas[d_id][0] for d_id in disciplinas_cursadas_obrigatoriamente(dados)), default=1)
+
+
+def limite_creditos(dados, creditos_minimos, CREDITOS_MAXIMOS_POR_SEMESTRE):
+    """
+    Limite pelo volume de créditos: créditos das disciplinas que precisam ser cursadas mais o que ainda
+    falta para atingir o mínimo de cada categoria de optativa, divididos pelo limite por semestre.
+    """
+    disciplinas = dados["disciplinas"]
+    cursadas = disciplinas_cursadas_obrigatoriamente(dados)
+    total = sum(int(disciplinas[d_id]['creditos']) for d_id in cursadas)
+
+    for categoria, chave in CHAVES_CATEGORIAS:
+        if not dados[chave]:
+            continue  # categoria sem disciplinas ofertadas não gera restrição no modelo
+        ja_cursados = sum(int(disciplinas[d_id]['creditos']) for d_id in dados[chave] if d_id in cursadas)
+        total += max(0, creditos_minimos[categoria] - ja_cursados)
+
+    return max(1, math.ceil(total / CREDITOS_MAXIMOS_POR_SEMESTRE))
+
+
+def limite_inferior_semestres(dados, creditos_minimos, NUM_SEMESTRES_MAX, CREDITOS_MAXIMOS_POR_SEMESTRE):
+    """Limite inferior válido para o número de semestres: o maior entre o caminho crítico e o volume de créditos."""
+    return max(
+        limite_caminho_critico(dados, NUM_SEMESTRES_MAX),
+        limite_creditos(dados, creditos_minimos, CREDITOS_MAXIMOS_POR_SEMESTRE),
+    )
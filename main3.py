@@ -1,48 +1,162 @@
 # main.py
+import argparse
+import sys
 import time
 from ortools.sat.python import cp_model
-from data_loader import carregar_dados
-from optimizer import resolver_grade
+from data_loader import carregar_dados, reduzir_turmas
+from compilacao import carregar_dados_compilados
+from optimizer import OBJETIVOS_SECUNDARIOS, ConfiguracaoSolver, resolver_grade, resolver_por_horizonte
+from heuristica import construir_grade_gulosa, resolver_rapido
+from portfolio import configuracoes_portfolio, resolver_portfolio
+from progresso import MonitorProgresso
+from perfil import Perfil, fase
+from diagnostico import explicar_infactibilidade
+from validador import imprimir_problemas, validar_dados
+from parametros import (
+    CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS, CREDITOS_MAXIMOS_POR_SEMESTRE, CREDITOS_MINIMOS, NUM_SEMESTRES
+)
+from cache import carregar_do_cache, chave_cache, resultado_definitivo, salvar_no_cache
 from visualizer import gerar_visualizacao_html, imprimir_grade_terminal
 
 def main():
+    parser = argparse.ArgumentParser(description="Gera a grade curricular otimizada.")
+    parser.add_argument("--modo", choices=["otimizacao", "horizonte", "rapido"], default="otimizacao",
+                        help="'otimizacao' minimiza o número de semestres; 'horizonte' testa horizontes crescentes "
+                             "a partir do limite inferior, com verificações de viabilidade; 'rapido' usa só a "
+                             "heurística gulosa (milissegundos, sem garantia de otimalidade)")
+    parser.add_argument("--workers", type=int, default=None, help="Número de workers do CP-SAT (padrão: o do solver)")
+    parser.add_argument("--tempo-limite", type=float, default=120.0, help="Tempo limite do solver, em segundos")
+    parser.add_argument("--limite-deterministico", type=float, default=None, help="Limite de tempo determinístico do CP-SAT")
+    parser.add_argument("--semente", type=int, default=None, help="Semente aleatória do CP-SAT")
+    parser.add_argument("--gap", type=float, default=None, help="Gap relativo para encerrar a otimização")
+    parser.add_argument("--log", action="store_true", help="Exibe o log de busca do CP-SAT")
+    parser.add_argument("--portfolio", type=int, default=0, metavar="N",
+                        help="Modo 'otimizacao': resolve com N configurações em paralelo (sementes e parâmetros "
+                             "diferentes, dividindo os workers) e fica com o melhor plano")
+    parser.add_argument("--progresso", metavar="ARQUIVO",
+                        help="Modo 'otimizacao': grava cada solução melhor (tempo, objetivo, limite, gap) em JSON lines "
+                             "('-' para a saída padrão)")
+    parser.add_argument("--parar-gap", type=float, default=None,
+                        help="Com --progresso: interrompe a busca quando o gap relativo chegar a este valor")
+    parser.add_argument("--parar-estagnacao", type=float, default=None, metavar="SEGUNDOS",
+                        help="Com --progresso: interrompe a busca após este tempo sem solução melhor")
+    parser.add_argument("--profile", nargs="?", const="perfil.json", default=None, metavar="ARQUIVO",
+                        help="Mede tempo, memória e tamanho do modelo de cada fase e exporta o relatório em JSON "
+                             "(padrão: perfil.json); não lê o cache, para que todas as fases sejam executadas")
+    parser.add_argument("--objetivos-secundarios", nargs="+", choices=OBJETIVOS_SECUNDARIOS, default=[], metavar="OBJETIVO",
+                        help="Desempates, em ordem de prioridade, entre grades com o mínimo de semestres "
+                             f"({', '.join(OBJETIVOS_SECUNDARIOS)}); só no modo de otimização sem portfólio")
+    parser.add_argument("--tempo-etapa", type=float, default=10.0,
+                        help="Tempo limite de cada objetivo secundário, em segundos")
+    parser.add_argument("--sem-simetrias", action="store_true",
+                        help="Não adiciona as restrições de quebra de simetria entre disciplinas intercambiáveis")
+    parser.add_argument("--sem-cache", action="store_true",
+                        help="Ignora o cache de soluções (não lê nem grava resultados em disco)")
+    parser.add_argument("--sem-compilado", action="store_true",
+                        help="Lê os arquivos JSON diretamente, sem usar nem gerar o catálogo compilado (ver 'compilacao.py')")
+    args = parser.parse_args()
+
+    configuracao = ConfiguracaoSolver(
+        num_workers=args.workers,
+        tempo_limite=args.tempo_limite,
+        limite_deterministico=args.limite_deterministico,
+        semente=args.semente,
+        log_progresso=args.log,
+        gap_relativo=args.gap,
+    )
+
     start_time = time.time()
 
-    # --- Parâmetros ---
-    CAMINHO_DISCIPLINAS = './attempt1/disciplinas.json'
-    CAMINHO_OFERTAS = './attempt1/ofertas.json'
-    NUM_SEMESTRES = 10
-    CREDITOS_MAXIMOS_POR_SEMESTRE = 32
-
-    # --- NOVO: Definir os créditos mínimos para cada categoria ---
-    # Nota: Usei 8 para 'restrita' conforme seu texto. A tabela indicava 4.
-    # Você pode ajustar esses valores facilmente aqui.
-    CREDITOS_MINIMOS = {
-        "restrita": 4,
-        "condicionada": 40,
-        "livre": 8
-    }
+    # Os parâmetros (caminhos, horizonte, limite e mínimos de créditos) ficam em 'parametros.py'
+    perfil = Perfil() if args.profile else None
 
     try:
-        dados = carregar_dados(CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS)
+        carregar = carregar_dados if args.sem_compilado else carregar_dados_compilados
+        dados = carregar(CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS, perfil=perfil)
+        with fase(perfil, "reducao_turmas"):
+            dados = reduzir_turmas(dados)
     except FileNotFoundError as e:
         print(f"Erro ao carregar dados: {e}")
         return
 
-    grade, creditos, status, obj_value = resolver_grade(
-        dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE
+    # Verificações baratas antes de montar o modelo: um erro aqui tornaria o modelo infactível
+    with fase(perfil, "validacao"):
+        problemas = validar_dados(dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+    if imprimir_problemas(problemas):
+        print('\nNenhuma solução encontrada: os dados de entrada são inconsistentes (ver erros acima).')
+        return
+
+    chave = None if args.sem_cache else chave_cache(
+        dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, args.modo, args.objetivos_secundarios,
+        quebrar_simetrias=not args.sem_simetrias, portfolio=args.portfolio if args.portfolio > 1 else 0
     )
+    resultado_cache = carregar_do_cache(chave) if chave and not perfil else None
+
+    if resultado_cache is not None:
+        print("Resultado obtido do cache (use --sem-cache para resolver novamente).")
+        grade, creditos, status, obj_value = resultado_cache
+    elif args.modo == "rapido":
+        grade, creditos, status, obj_value = resolver_rapido(
+            dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE
+        )
+    elif args.modo == "horizonte":
+        grade, creditos, status, obj_value = resolver_por_horizonte(
+            dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, configuracao=configuracao
+        )
+    elif args.portfolio > 1:
+        dica = construir_grade_gulosa(dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+        grade, creditos, status, obj_value = resolver_portfolio(
+            dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE,
+            configuracoes_portfolio(configuracao, args.portfolio), dica=dica
+        )
+    else:
+        # A solução da heurística gulosa serve de ponto de partida para o solver
+        with fase(perfil, "heuristica"):
+            dica = construir_grade_gulosa(dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+        destino = None
+        if args.progresso:
+            destino = sys.stdout if args.progresso == "-" else open(args.progresso, 'w', encoding='utf-8')
+        progresso = MonitorProgresso(destino, args.parar_gap, args.parar_estagnacao) if destino else None
+        estatisticas = {}
+        grade, creditos, status, obj_value = resolver_grade(
+            dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, dica=dica, configuracao=configuracao,
+            estatisticas=estatisticas, progresso=progresso, perfil=perfil, objetivos_secundarios=args.objetivos_secundarios,
+            tempo_por_etapa=args.tempo_etapa, quebrar_simetrias=not args.sem_simetrias
+        )
+        if destino is not None and destino is not sys.stdout:
+            destino.close()
+        if args.objetivos_secundarios:
+            for etapa in estatisticas.get("etapas", []):
+                print(f"Etapa '{etapa['objetivo']}': {etapa['valor']} ({etapa['status']}, {etapa['tempo_s']:.2f} s)")
+
+    if chave and resultado_cache is None and resultado_definitivo(status, args.modo):
+        salvar_no_cache(chave, (grade, creditos, status, obj_value))
 
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
         print(f'\nSolução encontrada em {time.time() - start_time:.2f} segundos.')
         print(f'Número mínimo de semestres: {obj_value}')
         imprimir_grade_terminal(grade, creditos)
-        gerar_visualizacao_html(grade, creditos)
+        with fase(perfil, "html"):
+            gerar_visualizacao_html(grade, creditos, dados=dados)
     elif status == cp_model.INFEASIBLE:
         print('\nNenhuma solução encontrada: O modelo é infactível.')
-        print('Verifique se a combinação de restrições é possível.')
+        print('Procurando um conjunto mínimo de restrições conflitantes...')
+        conflito = explicar_infactibilidade(dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+        if conflito:
+            print('Estas restrições não podem ser satisfeitas ao mesmo tempo:')
+            for _, descricao in conflito:
+                print(f'  - {descricao}')
+        elif conflito is not None:
+            print('O conflito não depende dos grupos verificados: revise os pré-requisitos (ciclos) e os horários das turmas.')
+        else:
+            print('Não foi possível isolar o conflito dentro do tempo limite. Verifique se a combinação de restrições é possível.')
     else:
         print('Nenhuma solução encontrada: O solver parou por outro motivo (ex: tempo limite).')
 
+    if perfil is not None:
+        perfil.imprimir()
+        perfil.salvar(args.profile)
+        print(f"\nRelatório de perfil salvo em '{args.profile}'.")
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,152 +1,576 @@
 # optimizer.py
+from dataclasses import dataclass, field, replace
 from ortools.sat.python import cp_model
+from data_loader import BLOCOS_PADRAO, CHAVES_CATEGORIAS, SEMESTRE_MINIMO_POR_DISCIPLINA, calcular_janelas, classes_de_simetria
+from limites import limite_inferior_semestres
+from perfil import encerrar_fase, fase, proxima_fase
+from resultado import AlocacaoTurma, PlanoGrade
 
-def resolver_grade(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE):
+# Objetivos secundários de 'resolver_grade', aplicados depois de minimizar o número de semestres
+OBJETIVOS_SECUNDARIOS = ("desequilibrio_creditos", "dias_no_campus", "creditos_excedentes")
+
+@dataclass
+class ConfiguracaoSolver:
     """
-    Cria e resolve o modelo de otimização da grade horária.
-    Retorna os resultados da otimização.
+    Parâmetros do CP-SAT repassados de 'main3.py' (--workers, --tempo-limite, --semente, --gap, --log...)
+    e das ferramentas de lote até o solver.
+    Campos com None mantêm o padrão do CP-SAT; 'extras' aceita qualquer outro parâmetro pelo nome
+    (ex: {"linearization_level": 2}), para portfólios com parametrizações diferentes.
+    """
+    num_workers: int = None
+    tempo_limite: float = 120.0
+    limite_deterministico: float = None
+    semente: int = None
+    log_progresso: bool = False
+    gap_relativo: float = None
+    extras: dict = field(default_factory=dict)
+
+    def aplicar(self, solver):
+        parametros = solver.parameters
+        parametros.max_time_in_seconds = self.tempo_limite
+        if self.num_workers is not None:
+            parametros.num_workers = self.num_workers
+        if self.limite_deterministico is not None:
+            parametros.max_deterministic_time = self.limite_deterministico
+        if self.semente is not None:
+            parametros.random_seed = self.semente
+        if self.gap_relativo is not None:
+            parametros.relative_gap_limit = self.gap_relativo
+        parametros.log_search_progress = self.log_progresso
+        for nome, valor in self.extras.items():
+            setattr(parametros, nome, valor)
+
+
+def construir_modelo(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE,
+                     objetivo=True, limite_inferior=None, parametrizavel=False, perfil=None, diagnostico=False,
+                     quebrar_simetrias=True):
+    """
+    Cria o modelo de otimização da grade horária, sem resolvê-lo.
+    Com objetivo=False o modelo é apenas de viabilidade (nenhuma função objetivo é definida).
+    'limite_inferior' é um limite válido para o número de semestres, usado para fechar o gap mais cedo.
+    Com parametrizavel=True, o limite de créditos e os mínimos por categoria viram variáveis de domínio
+    fixo e cada turma ganha um literal 'turma_ativa', para que cenários possam ser alterados editando
+    domínios, sem reconstruir o modelo (ver 'sessao.py').
+    'perfil' (ver 'perfil.py') mede cada etapa da construção, se informado.
+    Com diagnostico=True, cada grupo de restrições (cada obrigatória, cada mínimo de categoria, o limite
+    de créditos de cada semestre, cada regra de paridade e de semestre mínimo) fica condicionado a um
+    literal de suposição, devolvido em "suposicoes"; as janelas não são usadas, já que embutem paridade
+    e semestre mínimo (ver 'diagnostico.py').
+    Com quebrar_simetrias=True, as disciplinas intercambiáveis (ver 'classes_de_simetria') são cursadas
+    em ordem (R8); não vale para os modos parametrizável e diagnóstico, em que cancelar uma turma ou
+    desligar uma restrição pode desfazer a simetria.
+    Retorna um dicionário com o modelo e as variáveis necessárias para extrair a solução.
     """
     model = cp_model.CpModel()
 
     # Extrai as estruturas de dados do dicionário 'dados'
     disciplinas = dados["disciplinas"]
     turmas_por_disciplina = dados["turmas_por_disciplina"]
-    horarios_por_turma = dados["horarios_por_turma"]
+    horarios_idx_por_turma = dados["horarios_idx_por_turma"]
     periodos_validos_por_disciplina = dados["periodos_validos_por_disciplina"]
-    
+    eletivas_livres = dados["eletivas_livres"]
+
     obrigatorias_ids = dados["obrigatorias_ids"]
     restritas_ids = dados["restritas_ids"]
     condicionadas_ids = dados["condicionadas_ids"]
     livres_ids = dados["livres_ids"]
-    
+
     ids_optativas = restritas_ids + condicionadas_ids + livres_ids
 
+    # Janelas de semestres viáveis por disciplina (pré-requisitos, paridade, horizonte e regras como a do EEWU00):
+    # nenhuma variável é criada fora delas.
+    proxima_fase(perfil, "janelas_R7", model)
+    janelas = calcular_janelas(dados, NUM_SEMESTRES)
+
+    # Literais de suposição do modo diagnóstico, indexados por (grupo, identificador)
+    suposicoes = {}
+
+    def condicionar(restricao, grupo, identificador):
+        if diagnostico:
+            chave = (grupo, identificador)
+            if chave not in suposicoes:
+                suposicoes[chave] = model.NewBoolVar(f'suposicao_{grupo}_{identificador}')
+            restricao.OnlyEnforceIf(suposicoes[chave])
+
     # --- 3. Criar as Variáveis de Decisão ---
+    proxima_fase(perfil, "variaveis", model)
+    # Os índices são preenchidos junto com 'alocacao', para que cada família de restrições
+    # encontre suas variáveis diretamente, sem varrer o dicionário inteiro.
     alocacao = {}
+    alocacao_livre = {}
+    vars_por_disciplina = {d_id: [] for d_id in disciplinas}
+    vars_por_disciplina_semestre = {}
+    vars_por_semestre = {s: [] for s in range(1, NUM_SEMESTRES + 1)}
+    livres_por_semestre = {s: [] for s in range(1, NUM_SEMESTRES + 1)}
+
+    semestres_validos = {}
     for d_id in disciplinas:
         periodos_validos = periodos_validos_por_disciplina.get(d_id, {1, 2})
         oferta_em_impar = 1 in periodos_validos
         oferta_em_par = 2 in periodos_validos
+        inicio, fim = janelas[d_id]
+        semestres_validos[d_id] = list(range(1, NUM_SEMESTRES + 1)) if diagnostico else [
+            s for s in range(inicio, fim + 1)
+            if (s % 2 != 0 and oferta_em_impar) or (s % 2 == 0 and oferta_em_par)
+        ]
+
+        # Eletivas livres não têm turmas: uma variável por semestre indica em qual semestre são cursadas.
+        if d_id in eletivas_livres:
+            for s in semestres_validos[d_id]:
+                var = model.NewBoolVar(f'livre_{d_id}_s{s}')
+                alocacao_livre[(d_id, s)] = var
+                livres_por_semestre[s].append(eletivas_livres[d_id] * var)
+                vars_por_disciplina[d_id].append(var)
+                vars_por_disciplina_semestre.setdefault((d_id, s), []).append(var)
+            continue
 
         for t_id in turmas_por_disciplina.get(d_id, []):
-            for s in range(1, NUM_SEMESTRES + 1):
-                is_semestre_impar = (s % 2 != 0)
-                if (is_semestre_impar and oferta_em_impar) or (not is_semestre_impar and oferta_em_par):
-                    alocacao[(d_id, s, t_id)] = model.NewBoolVar(f'alocacao_{d_id}_s{s}_t{t_id}')
+            for s in semestres_validos[d_id]:
+                var = model.NewBoolVar(f'alocacao_{d_id}_s{s}_t{t_id}')
+                alocacao[(d_id, s, t_id)] = var
+                vars_por_disciplina[d_id].append(var)
+                vars_por_disciplina_semestre.setdefault((d_id, s), []).append(var)
+                vars_por_semestre[s].append((t_id, var))
 
+    # O domínio começa no início da janela; NUM_SEMESTRES + 1 representa disciplinas não cursadas.
+    # (Um domínio contínuo resolve mais rápido que um com buracos; as ligações de R2 já fixam o valor.)
     semestre_da_disciplina = {
-        d_id: model.NewIntVar(1, NUM_SEMESTRES + 1, f'semestre_{d_id}') # +1 para disciplinas não cursadas
+        d_id: model.NewIntVar(min(semestres_validos[d_id] + [NUM_SEMESTRES + 1]), NUM_SEMESTRES + 1, f'semestre_{d_id}')
         for d_id in disciplinas
     }
 
-    # --- MUDANÇA AQUI: Dicionário para guardar as variáveis 'cursada' ---
     cursada_vars = {}
 
+    # Parâmetros do cenário: constantes, ou variáveis de domínio fixo quando o modelo é parametrizável
+    if parametrizavel:
+        limite_creditos = model.NewIntVar(CREDITOS_MAXIMOS_POR_SEMESTRE, CREDITOS_MAXIMOS_POR_SEMESTRE, 'limite_creditos')
+        minimos_por_categoria = {
+            categoria: model.NewIntVar(minimo, minimo, f'minimo_{categoria}') for categoria, minimo in creditos_minimos.items()
+        }
+        turma_ativa = {}
+        for (d_id, s, t_id), var in alocacao.items():
+            # Livre por padrão; fixar o domínio em 0 cancela a turma
+            if t_id not in turma_ativa:
+                turma_ativa[t_id] = model.NewBoolVar(f'ativa_{t_id}')
+            model.AddImplication(var, turma_ativa[t_id])
+    else:
+        limite_creditos = CREDITOS_MAXIMOS_POR_SEMESTRE
+        minimos_por_categoria = creditos_minimos
+        turma_ativa = {}
+
     # --- 4. Adicionar as Restrições ---
 
+    proxima_fase(perfil, "R1_cursar_uma_vez", model)
     # R1.1: Disciplinas OBRIGATÓRIAS devem ser cursadas EXATAMENTE uma vez.
     for d_id in obrigatorias_ids:
-        model.AddExactlyOne([var for key, var in alocacao.items() if key[0] == d_id])
+        condicionar(model.AddExactlyOne(vars_por_disciplina[d_id]), "obrigatoria", d_id)
 
     # R1.2: Disciplinas OPTATIVAS podem ser cursadas NO MÁXIMO uma vez.
     for d_id in ids_optativas:
-        model.AddAtMostOne([var for key, var in alocacao.items() if key[0] == d_id])
+        model.AddAtMostOne(vars_por_disciplina[d_id])
 
     # R2 (Ligação): Ligar 'semestre_da_disciplina' com 'alocacao'.
+    proxima_fase(perfil, "R2_ligacao", model)
     for d_id in disciplinas:
         cursada = model.NewBoolVar(f'cursada_{d_id}')
-        cursada_vars[d_id] = cursada # --- MUDANÇA AQUI: Armazena a variável ---
+        cursada_vars[d_id] = cursada
 
-        model.Add(sum(var for key, var in alocacao.items() if key[0] == d_id) == 1).OnlyEnforceIf(cursada)
-        model.Add(sum(var for key, var in alocacao.items() if key[0] == d_id) == 0).OnlyEnforceIf(cursada.Not())
-        
-        for s in range(1, NUM_SEMESTRES + 1):
+        model.Add(sum(vars_por_disciplina[d_id]) == 1).OnlyEnforceIf(cursada)
+        model.Add(sum(vars_por_disciplina[d_id]) == 0).OnlyEnforceIf(cursada.Not())
+
+        for s in semestres_validos[d_id]:
+            turmas_no_s = vars_por_disciplina_semestre.get((d_id, s), [])
+            if not turmas_no_s: continue
             cursada_em_s = model.NewBoolVar(f'{d_id}_cursada_em_s{s}')
-            turmas_no_s = [var for key, var in alocacao.items() if key[0] == d_id and key[1] == s]
-            if not turmas_no_s: model.Add(cursada_em_s == 0)
-            else: 
-                model.Add(sum(turmas_no_s) >= 1).OnlyEnforceIf(cursada_em_s)
-                model.Add(sum(turmas_no_s) == 0).OnlyEnforceIf(cursada_em_s.Not())
+            model.Add(sum(turmas_no_s) >= 1).OnlyEnforceIf(cursada_em_s)
+            model.Add(sum(turmas_no_s) == 0).OnlyEnforceIf(cursada_em_s.Not())
             model.Add(semestre_da_disciplina[d_id] == s).OnlyEnforceIf(cursada_em_s)
-        
+
         model.Add(semestre_da_disciplina[d_id] == NUM_SEMESTRES + 1).OnlyEnforceIf(cursada.Not())
 
-    # R3: NOVAS RESTRIÇÕES DE CRÉDITOS MÍNIMOS POR CATEGORIA
-    termos_creditos_restritas = []
-    for d_id in restritas_ids:
-        cred = int(disciplinas[d_id]['creditos'])
-        cursada = cursada_vars[d_id] # --- MUDANÇA AQUI: Acessa a variável pelo dicionário ---
-        termos_creditos_restritas.append(cred * cursada)
-    if termos_creditos_restritas:
-        model.Add(sum(termos_creditos_restritas) >= creditos_minimos['restrita'])
-
-    termos_creditos_condicionadas = []
-    for d_id in condicionadas_ids:
-        cred = int(disciplinas[d_id]['creditos'])
-        cursada = cursada_vars[d_id] # --- MUDANÇA AQUI: Acessa a variável pelo dicionário ---
-        termos_creditos_condicionadas.append(cred * cursada)
-    if termos_creditos_condicionadas:
-        model.Add(sum(termos_creditos_condicionadas) >= creditos_minimos['condicionada'])
-
-    termos_creditos_livres = []
-    for d_id in livres_ids:
-        cred = int(disciplinas[d_id]['creditos'])
-        cursada = cursada_vars[d_id] # --- MUDANÇA AQUI: Acessa a variável pelo dicionário ---
-        termos_creditos_livres.append(cred * cursada)
-    if termos_creditos_livres:
-        model.Add(sum(termos_creditos_livres) >= creditos_minimos['livre'])
+    # R3: Créditos mínimos por categoria de optativa
+    proxima_fase(perfil, "R3_creditos_minimos", model)
+    for categoria, chave in CHAVES_CATEGORIAS:
+        termos_creditos = [int(disciplinas[d_id]['creditos']) * cursada_vars[d_id] for d_id in dados[chave]]
+        if termos_creditos:
+            condicionar(model.Add(sum(termos_creditos) >= minimos_por_categoria[categoria]), "creditos_minimos", categoria)
 
     # Demais restrições (R4, R5, R6)
+    proxima_fase(perfil, "R5_pre_requisitos", model)
     for d_id, disc_info in disciplinas.items():
         for prereq_id in disc_info.get('prerequisitos', []):
             if prereq_id in semestre_da_disciplina:
                 model.Add(semestre_da_disciplina[d_id] > semestre_da_disciplina[prereq_id])
 
+    proxima_fase(perfil, "R4_conflitos_horario", model)
     for s in range(1, NUM_SEMESTRES + 1):
         horarios_do_semestre = {}
-        for (d, sem, t), var in alocacao.items():
-            if sem == s:
-                for h in horarios_por_turma.get(t, []):
-                    if h not in horarios_do_semestre: horarios_do_semestre[h] = []
-                    horarios_do_semestre[h].append(var)
+        for t_id, var in vars_por_semestre[s]:
+            for h in horarios_idx_por_turma[t_id]:
+                horarios_do_semestre.setdefault(h, []).append(var)
         for h, turmas_conflitantes in horarios_do_semestre.items():
             model.AddAtMostOne(turmas_conflitantes)
 
+        # R4.1: As eletivas livres do semestre precisam caber nos blocos padrão que sobraram livres.
+        # Como cada bloco é usado por no máximo uma turma, a soma abaixo conta os blocos ocupados
+        # (os blocos padrão são os índices 0..19 de 'horarios').
+        if livres_por_semestre[s]:
+            blocos_ocupados = [var for h in range(len(BLOCOS_PADRAO)) for var in horarios_do_semestre.get(h, [])]
+            model.Add(sum(blocos_ocupados) + sum(livres_por_semestre[s]) <= len(BLOCOS_PADRAO))
+
+    proxima_fase(perfil, "R6_creditos_maximos", model)
     for s in range(1, NUM_SEMESTRES + 1):
         termos_de_credito = []
         for d_id in disciplinas:
-            creditos = int(disciplinas[d_id]['creditos'])
-            cursada_neste_semestre_vars = [var for (d, sem, t), var in alocacao.items() if d == d_id and sem == s]
-            if cursada_neste_semestre_vars: termos_de_credito.append(creditos * sum(cursada_neste_semestre_vars))
-        if termos_de_credito: model.Add(sum(termos_de_credito) <= CREDITOS_MAXIMOS_POR_SEMESTRE)
-
-    # --- R7 (NOVA RESTRIÇÃO): Regras específicas de disciplinas ---
-    # O Estágio Obrigatório (EEWU00) só pode ser cursado a partir do 6º semestre.
-    id_estagio = "EEWU00"
-    if id_estagio in semestre_da_disciplina:
-        model.Add(semestre_da_disciplina[id_estagio] >= 6)
-    
+            cursada_neste_semestre_vars = vars_por_disciplina_semestre.get((d_id, s))
+            if cursada_neste_semestre_vars:
+                creditos = int(disciplinas[d_id]['creditos'])
+                termos_de_credito.append(creditos * sum(cursada_neste_semestre_vars))
+        if termos_de_credito: condicionar(model.Add(sum(termos_de_credito) <= limite_creditos), "limite_creditos", s)
+
+    # --- R7: Regras específicas de disciplinas ---
+    # Já aplicadas pelas janelas: o semestre mínimo (ex: EEWU00 a partir do 6º semestre, ver
+    # SEMESTRE_MINIMO_POR_DISCIPLINA em 'data_loader') é o ponto de partida do início da janela.
+    # No modo diagnóstico (sem janelas), paridade e semestre mínimo viram restrições condicionadas.
+    if diagnostico:
+        for d_id in disciplinas:
+            periodos_validos = periodos_validos_por_disciplina.get(d_id, {1, 2})
+            fora_da_paridade = [
+                var for s in semestres_validos[d_id] if (1 if s % 2 != 0 else 2) not in periodos_validos
+                for var in vars_por_disciplina_semestre.get((d_id, s), [])
+            ]
+            if fora_da_paridade:
+                condicionar(model.Add(sum(fora_da_paridade) == 0), "paridade", d_id)
+            semestre_minimo = disciplinas[d_id].get('semestre_minimo') or SEMESTRE_MINIMO_POR_DISCIPLINA.get(d_id, 1)
+            if semestre_minimo > 1:
+                condicionar(model.Add(semestre_da_disciplina[d_id] >= semestre_minimo), "semestre_minimo", d_id)
+
+    # --- R8: Quebra de simetrias ---
+    # Numa classe de disciplinas intercambiáveis, qualquer grade pode ser reordenada para que cada uma
+    # seja cursada no máximo no semestre da seguinte (não cursada = NUM_SEMESTRES + 1, então quem é
+    # cursada vem antes) e, no mesmo semestre, em uma turma de posição canônica menor ou igual.
+    classes_simetria = classes_de_simetria(dados) if quebrar_simetrias and not (parametrizavel or diagnostico) else []
+    if classes_simetria:
+        proxima_fase(perfil, "R8_simetrias", model)
+    for classe in classes_simetria:
+        for (d_a, turmas_a), (d_b, turmas_b) in zip(classe, classe[1:]):
+            model.Add(semestre_da_disciplina[d_a] <= semestre_da_disciplina[d_b])
+            for s in semestres_validos[d_a]:
+                for k, t_b in enumerate(turmas_b):
+                    var_b = alocacao.get((d_b, s, t_b))
+                    if var_b is None:
+                        continue
+                    for t_a in turmas_a[k + 1:]:
+                        if (d_a, s, t_a) in alocacao:
+                            model.AddImplication(var_b, alocacao[(d_a, s, t_a)].Not())
+
     # --- 5. Definir a Função Objetivo ---
-    semestre_maximo = model.NewIntVar(1, NUM_SEMESTRES + 1, 'semestre_maximo')
-    model.AddMaxEquality(semestre_maximo, list(semestre_da_disciplina.values()))
-    model.Minimize(semestre_maximo)
+    # Só as disciplinas cursadas contam: as não cursadas ficam em NUM_SEMESTRES + 1.
+    proxima_fase(perfil, "objetivo", model)
+    semestre_maximo = model.NewIntVar(1, NUM_SEMESTRES, 'semestre_maximo')
+    for d_id in disciplinas:
+        model.Add(semestre_maximo >= semestre_da_disciplina[d_id]).OnlyEnforceIf(cursada_vars[d_id])
+    if limite_inferior is not None:
+        model.Add(semestre_maximo >= limite_inferior)
+    if objetivo:
+        model.Minimize(semestre_maximo)
+    encerrar_fase(perfil)
+
+    return {
+        "model": model,
+        "alocacao": alocacao,
+        "alocacao_livre": alocacao_livre,
+        "semestre_da_disciplina": semestre_da_disciplina,
+        "cursada_vars": cursada_vars,
+        "semestre_maximo": semestre_maximo,
+        "NUM_SEMESTRES": NUM_SEMESTRES,
+        "limite_creditos": limite_creditos,
+        "minimos_por_categoria": minimos_por_categoria,
+        "turma_ativa": turma_ativa,
+        "suposicoes": suposicoes,
+        "classes_simetria": classes_simetria,
+    }
+
+
+def extrair_plano(modelo, solver):
+    """
+    Lê os valores das variáveis de alocação e retorna o plano {d_id: (semestre, t_id)}.
+    Eletivas livres não têm turma: aparecem como (semestre, None).
+    """
+    plano = {}
+    for (d_id, s, t_id), var in modelo["alocacao"].items():
+        if solver.Value(var):
+            plano[d_id] = (s, t_id)
+    for (d_id, s), var in modelo["alocacao_livre"].items():
+        if solver.Value(var):
+            plano[d_id] = (s, None)
+    return plano
+
+
+def formatar_grade(dados, plano, NUM_SEMESTRES):
+    """
+    Monta a grade (um PlanoGrade, ver 'resultado.py') e os créditos por semestre a partir de um plano
+    {d_id: (semestre, t_id)}.
+    """
+    disciplinas = dados["disciplinas"]
+    horarios_idx_por_turma = dados["horarios_idx_por_turma"]
+    mascara_por_turma = dados["mascara_por_turma"]
+
+    alocacoes = []
+    mascara_usada = {s: 0 for s in range(1, NUM_SEMESTRES + 1)}
+    for d_id, (s, t_id) in plano.items():
+        if t_id is None:
+            continue
+        alocacoes.append(AlocacaoTurma(d_id, disciplinas[d_id]["nome"], t_id, s, int(disciplinas[d_id]['creditos']),
+                                       horarios_idx_por_turma[t_id]))
+        mascara_usada[s] |= mascara_por_turma[t_id]
+
+    # Eletivas livres: escolhe concretamente os primeiros blocos padrão ainda vagos no semestre
+    # e, se a disciplina veio de turmas enumeradas, reporta a turma real com esses horários.
+    for d_id, (s, t_id) in sorted(plano.items()):
+        if t_id is not None:
+            continue
+        livres = [i for i in range(len(BLOCOS_PADRAO)) if not mascara_usada[s] >> i & 1][:dados["eletivas_livres"][d_id]]
+        mascara_usada[s] |= sum(1 << i for i in livres)
+        blocos = [BLOCOS_PADRAO[i] for i in livres]
+        t_id = dados["turmas_livres_por_horarios"][d_id].get(frozenset(blocos), f"{d_id}-LIVRE")
+        # Os blocos padrão ocupam os índices 0..19 de 'horarios'
+        alocacoes.append(AlocacaoTurma(d_id, disciplinas[d_id]["nome"], t_id, s, int(disciplinas[d_id]['creditos']), livres))
+
+    grade = PlanoGrade(alocacoes, dados["horarios"], NUM_SEMESTRES)
+    return grade, grade.creditos_por_semestre()
+
+
+def extrair_grade(dados, modelo, solver):
+    """
+    Lê os valores das variáveis de alocação e monta a grade e os créditos por semestre.
+    """
+    return formatar_grade(dados, extrair_plano(modelo, solver), modelo["NUM_SEMESTRES"])
+
+
+def canonizar_plano(plano, classes_simetria):
+    """
+    Reordena um plano {d_id: (semestre, t_id)} dentro de cada classe de simetria (ver 'classes_de_simetria')
+    para que ele satisfaça a quebra de simetrias (R8): as posições ocupadas pela classe, em ordem de semestre
+    e turma, vão para as disciplinas em ordem de ID. O plano reordenado é equivalente ao original.
+    """
+    plano = dict(plano)
+    for classe in classes_simetria:
+        posicoes = sorted(
+            (plano[d_id][0], turmas.index(plano[d_id][1]) if plano[d_id][1] is not None else -1)
+            for d_id, turmas in classe if d_id in plano
+        )
+        for d_id, _ in classe:
+            plano.pop(d_id, None)
+        for (d_id, turmas), (s, k) in zip(classe, posicoes):
+            plano[d_id] = (s, turmas[k] if k >= 0 else None)
+    return plano
+
+
+def aplicar_dica(modelo, plano):
+    """
+    Usa um plano {d_id: (semestre, t_id)} como solução inicial (hints) do CP-SAT,
+    para que a busca comece de uma solução boa em vez de partir do zero.
+    O plano é antes reordenado para respeitar a quebra de simetrias do modelo, se houver.
+    """
+    plano = canonizar_plano(plano, modelo.get("classes_simetria", []))
+    model = modelo["model"]
+    NUM_SEMESTRES = modelo["NUM_SEMESTRES"]
+    for (d_id, s, t_id), var in modelo["alocacao"].items():
+        model.AddHint(var, plano.get(d_id) == (s, t_id))
+    for (d_id, s), var in modelo["alocacao_livre"].items():
+        model.AddHint(var, plano.get(d_id) == (s, None))
+    for d_id, cursada in modelo["cursada_vars"].items():
+        model.AddHint(cursada, d_id in plano)
+        model.AddHint(modelo["semestre_da_disciplina"][d_id], plano[d_id][0] if d_id in plano else NUM_SEMESTRES + 1)
+    if plano:
+        model.AddHint(modelo["semestre_maximo"], max(s for s, _ in plano.values()))
+
+
+def _creditos_por_semestre_expr(modelo, dados, semestres):
+    """Expressão dos créditos cursados em cada semestre de 'semestres' (turmas e eletivas livres)."""
+    disciplinas = dados["disciplinas"]
+    termos = {s: [] for s in semestres}
+    for (d_id, s, _), var in modelo["alocacao"].items():
+        if s in termos:
+            termos[s].append(int(disciplinas[d_id]['creditos']) * var)
+    for (d_id, s), var in modelo["alocacao_livre"].items():
+        if s in termos:
+            termos[s].append(int(disciplinas[d_id]['creditos']) * var)
+    return {s: sum(t) for s, t in termos.items()}
+
+
+def objetivo_secundario(modelo, dados, creditos_minimos, nome, semestres):
+    """
+    Cria no modelo a expressão de um objetivo secundário (ver OBJETIVOS_SECUNDARIOS), restrita aos
+    semestres 1..'semestres' (o ótimo da primeira etapa), e a retorna.
+    """
+    model = modelo["model"]
+    intervalo = range(1, semestres + 1)
+
+    if nome == "desequilibrio_creditos":
+        # Diferença entre o semestre mais carregado e o mais leve
+        creditos = _creditos_por_semestre_expr(modelo, dados, intervalo)
+        total = sum(int(d['creditos']) for d in dados["disciplinas"].values())
+        maior = model.NewIntVar(0, total, 'creditos_semestre_mais_carregado')
+        menor = model.NewIntVar(0, total, 'creditos_semestre_mais_leve')
+        for s in intervalo:
+            model.Add(maior >= creditos[s])
+            model.Add(menor <= creditos[s])
+        return maior - menor
+
+    if nome == "dias_no_campus":
+        # Um literal por (semestre, dia da semana) com aula, com o dia de 'partes_horario'; um horário fora
+        # do formato DIA-HH-HH conta como um dia à parte. As eletivas livres ficam de fora: seus blocos só
+        # são escolhidos em 'formatar_grade'.
+        dia_do_horario = [partes[0] if partes else h for h, partes in enumerate(dados["partes_horario"])]
+        presenca = {}
+        for (d_id, s, t_id), var in modelo["alocacao"].items():
+            if s > semestres:
+                continue
+            for dia in {dia_do_horario[h] for h in dados["horarios_idx_por_turma"][t_id]}:
+                if (s, dia) not in presenca:
+                    presenca[(s, dia)] = model.NewBoolVar(f'aula_s{s}_{dia}')
+                model.AddImplication(var, presenca[(s, dia)])
+        return sum(presenca.values())
+
+    if nome == "creditos_excedentes":
+        # Créditos de optativas acima do mínimo de cada categoria (as vazias não têm mínimo, como em R3)
+        excedente = 0
+        for categoria, chave in CHAVES_CATEGORIAS:
+            if dados[chave]:
+                cursados = sum(int(dados["disciplinas"][d_id]['creditos']) * modelo["cursada_vars"][d_id] for d_id in dados[chave])
+                excedente += cursados - creditos_minimos[categoria]
+        return excedente
+
+    raise ValueError(f"Objetivo secundário desconhecido: '{nome}' (opções: {', '.join(OBJETIVOS_SECUNDARIOS)})")
+
+
+def repetir_solucao_como_dica(model, solver, num_variaveis):
+    """Substitui as dicas pelos valores da última solução (as variáveis criadas depois dela ficam sem dica)."""
+    model.ClearHints()
+    for i in range(num_variaveis):
+        var = model.GetIntVarFromProtoIndex(i)
+        model.AddHint(var, solver.Value(var))
+
+
+def resolver_grade(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, dica=None, configuracao=None,
+                   estatisticas=None, progresso=None, perfil=None, objetivos_secundarios=(), tempo_por_etapa=None,
+                   quebrar_simetrias=True):
+    """
+    Cria e resolve o modelo de otimização da grade horária.
+    'dica' é um plano {d_id: (semestre, t_id)} (ex: da heurística gulosa) usado como solução inicial.
+    'configuracao' é uma ConfiguracaoSolver (padrão: 120 s e os demais parâmetros do CP-SAT).
+    Se 'estatisticas' for um dicionário, recebe o limite inferior e o tamanho do modelo (variáveis e restrições).
+    'progresso' é um MonitorProgresso (ver 'progresso.py'), que acompanha e pode interromper a busca.
+    'perfil' (ver 'perfil.py') mede o limite inferior, cada etapa da construção, a resolução e a extração.
+    'quebrar_simetrias' (padrão) ordena as disciplinas intercambiáveis (ver 'construir_modelo').
+
+    'objetivos_secundarios' (nomes de OBJETIVOS_SECUNDARIOS, em ordem de prioridade) desempatam as grades
+    com o mesmo número de semestres, lexicograficamente: cada etapa fixa o valor da anterior como restrição
+    e minimiza o próximo objetivo no mesmo modelo, partindo da solução anterior como dica. Se uma etapa
+    não achar solução, vale a da etapa anterior. Os valores de cada
+    etapa vão para estatisticas["etapas"]. O status só é OPTIMAL se todas as etapas foram provadas ótimas.
+    'tempo_por_etapa' (s) substitui o tempo limite da 'configuracao' nas etapas secundárias: como partem
+    de uma solução completa, costumam melhorá-la em poucos segundos, e provar o ótimo pode demorar muito.
+
+    Retorna os resultados da otimização (o objetivo é sempre o número de semestres).
+    """
+    with fase(perfil, "limite_inferior"):
+        limite_inferior = limite_inferior_semestres(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+    if estatisticas is not None:
+        estatisticas.update({"limite_inferior": limite_inferior, "variaveis": 0, "restricoes": 0})
+    if limite_inferior > NUM_SEMESTRES:
+        return None, None, cp_model.INFEASIBLE, None
+    modelo = construir_modelo(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE,
+                              limite_inferior=limite_inferior, perfil=perfil, quebrar_simetrias=quebrar_simetrias)
+    if estatisticas is not None:
+        proto = modelo["model"].Proto()
+        estatisticas.update({"variaveis": len(proto.variables), "restricoes": len(proto.constraints)})
+    if dica:
+        aplicar_dica(modelo, dica)
 
     # --- 6. Chamar o Solver ---
     solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 120.0
-    status = solver.Solve(model)
-    
+    (configuracao or ConfiguracaoSolver()).aplicar(solver)
+    with fase(perfil, "resolucao"):
+        if progresso is not None:
+            progresso.iniciar(solver)
+            status = solver.Solve(modelo["model"], progresso)
+            progresso.encerrar(status)
+        else:
+            status = solver.Solve(modelo["model"])
+
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        return None, None, status, None
+    semestres = int(solver.ObjectiveValue())
+    etapas = [{"objetivo": "semestres", "valor": semestres, "status": solver.StatusName(status),
+               "tempo_s": round(solver.WallTime(), 4)}]
+
+    # --- 6.1. Objetivos secundários (lexicográficos) ---
+    model = modelo["model"]
+    configuracao_etapa = configuracao or ConfiguracaoSolver()
+    if tempo_por_etapa is not None:
+        configuracao_etapa = replace(configuracao_etapa, tempo_limite=tempo_por_etapa)
+    expressao_anterior, valor_anterior = modelo["semestre_maximo"], semestres
+    for nome in objetivos_secundarios:
+        with fase(perfil, f"objetivo_{nome}"):
+            num_variaveis = len(model.Proto().variables)
+            expressao = objetivo_secundario(modelo, dados, creditos_minimos, nome, semestres)
+            # Fixa a etapa anterior: o valor encontrado passa a ser um limite, satisfeito pela dica
+            model.Add(expressao_anterior <= valor_anterior)
+            model.Minimize(expressao)
+            repetir_solucao_como_dica(model, solver, num_variaveis)
+
+            solver_etapa = cp_model.CpSolver()
+            configuracao_etapa.aplicar(solver_etapa)
+            status_etapa = solver_etapa.Solve(model)
+        if status_etapa != cp_model.OPTIMAL and status_etapa != cp_model.FEASIBLE:
+            etapas.append({"objetivo": nome, "valor": None, "status": solver_etapa.StatusName(status_etapa),
+                           "tempo_s": round(solver_etapa.WallTime(), 4)})
+            status = cp_model.FEASIBLE
+            break
+        solver = solver_etapa
+        expressao_anterior, valor_anterior = expressao, int(solver.ObjectiveValue())
+        etapas.append({"objetivo": nome, "valor": valor_anterior, "status": solver.StatusName(status_etapa),
+                       "tempo_s": round(solver.WallTime(), 4)})
+        if status_etapa != cp_model.OPTIMAL:
+            status = cp_model.FEASIBLE
+    if estatisticas is not None:
+        estatisticas["etapas"] = etapas
+
     # --- 7. Processar e Retornar os Resultados ---
-    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        grade = {s: [] for s in range(1, NUM_SEMESTRES + 1)}
-        creditos_por_semestre = {s: 0 for s in range(1, NUM_SEMESTRES + 1)}
+    with fase(perfil, "extracao"):
+        grade, creditos_por_semestre = extrair_grade(dados, modelo, solver)
+    return grade, creditos_por_semestre, status, float(semestres)
 
-        for (d_id, s, t_id), var in alocacao.items():
-            if solver.Value(var):
-                string_disciplina = f'{disciplinas[d_id]["nome"]} (Turma: {t_id}) --- Horários: [{", ".join(horarios_por_turma.get(t_id, []))}]'
-                grade[s].append(string_disciplina)
-                creditos_por_semestre[s] += disciplinas[d_id]['creditos']
-        
-        return grade, creditos_por_semestre, status, solver.ObjectiveValue()
-    
-    return None, None, status, None
\ No newline at end of file
+
+def resolver_por_horizonte(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, configuracao=None):
+    """
+    Resolve a grade aumentando o horizonte um semestre por vez, a partir do limite inferior, com
+    verificações de viabilidade pura (modelos menores e sem objetivo). O primeiro horizonte viável
+    é o número mínimo de semestres, desde que todos os anteriores tenham sido provados infactíveis.
+    A 'configuracao' (ConfiguracaoSolver) vale para cada verificação.
+    Retorna os resultados no mesmo formato de 'resolver_grade'.
+    """
+    limite_inferior = limite_inferior_semestres(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+    print(f"Limite inferior: {limite_inferior} semestres.")
+
+    todos_infactiveis = True
+    for horizonte in range(limite_inferior, NUM_SEMESTRES + 1):
+        modelo = construir_modelo(dados, creditos_minimos, horizonte, CREDITOS_MAXIMOS_POR_SEMESTRE, objetivo=False)
+        solver = cp_model.CpSolver()
+        (configuracao or ConfiguracaoSolver()).aplicar(solver)
+        status = solver.Solve(modelo["model"])
+        print(f"  Horizonte {horizonte}: {solver.StatusName(status)} ({solver.WallTime():.2f}s)")
+
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+            grade, creditos_por_semestre = extrair_grade(dados, modelo, solver)
+            semestres_usados = solver.Value(modelo["semestre_maximo"])
+            # Só é ótimo se todos os horizontes menores foram provados infactíveis
+            status = cp_model.OPTIMAL if todos_infactiveis and semestres_usados == horizonte else cp_model.FEASIBLE
+            return grade, creditos_por_semestre, status, float(semestres_usados)
+        if status != cp_model.INFEASIBLE:
+            todos_infactiveis = False
+
+    return None, None, cp_model.INFEASIBLE if todos_infactiveis else cp_model.UNKNOWN, None
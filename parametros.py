@@ -0,0 +1,16 @@
+# parametros.py
+# Parâmetros do currículo compartilhados por 'main3.py', pelos scripts de diagnóstico e pelas ferramentas
+# de lote, para que todos resolvam (e validem) o mesmo problema.
+
+CAMINHO_DISCIPLINAS = './attempt1/disciplinas.json'
+CAMINHO_OFERTAS = './attempt1/ofertas.json'
+NUM_SEMESTRES = 10
+CREDITOS_MAXIMOS_POR_SEMESTRE = 32
+
+# --- Créditos mínimos para cada categoria de optativa ---
+# Nota: o texto do currículo pedia 8 para 'restrita'; a tabela indica 4, que é o valor usado.
+CREDITOS_MINIMOS = {
+    "restrita": 4,
+    "condicionada": 40,
+    "livre": 8
+}
@@ -0,0 +1,125 @@
+# perfil.py
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def pico_memoria_mb():
+    """Pico de memória residente do processo atual, em MB (None se indisponível)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é dado em KB no Linux e em bytes no macOS
+    return pico / (1024 * 1024) if platform.system() == "Darwin" else pico / 1024
+
+
+def memoria_residente_mb():
+    """Memória residente atual do processo, em MB, lida de /proc/self/statm (None fora do Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(paginas * os.sysconf("SC_PAGE_SIZE") / 2**20, 3)
+
+
+class Perfil:
+    """
+    Mede cada fase do pipeline: tempo de parede, pico de memória Python (tracemalloc) durante a fase,
+    memória residente do processo ao final da fase, o pico de memória residente do processo até ali
+    (cumulativo: só cresce) e, para fases de construção do modelo, quantas variáveis e restrições a
+    fase criou. As fases não são aninhadas (o pico do tracemalloc é zerado a cada uma):
+    use 'fase' como gerenciador de contexto ou, em funções longas, 'proxima_fase' para marcar a troca.
+
+    O tracemalloc só enxerga alocações do Python: o proto do CP-SAT vive em C++ e aparece apenas
+    na memória residente.
+    """
+
+    def __init__(self):
+        self.fases = []
+        self._aberta = None
+        self._inicio = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def iniciar(self, nome, model=None):
+        """Abre uma fase (fechando a anterior, se ainda estiver aberta)."""
+        self.encerrar()
+        contagem = None
+        if model is not None:
+            proto = model.Proto()
+            contagem = (len(proto.variables), len(proto.constraints))
+        tracemalloc.reset_peak()
+        self._aberta = (nome, model, contagem, tracemalloc.get_traced_memory()[0], time.perf_counter())
+
+    def encerrar(self):
+        """Fecha a fase aberta, se houver, e registra suas medidas."""
+        if self._aberta is None:
+            return
+        nome, model, contagem, memoria_antes, inicio = self._aberta
+        self._aberta = None
+        decorrido = time.perf_counter() - inicio
+        memoria_atual, pico = tracemalloc.get_traced_memory()
+        registro = {
+            "fase": nome,
+            "tempo_s": round(decorrido, 4),
+            "pico_python_mb": round((pico - memoria_antes) / 2**20, 3),
+            "retido_python_mb": round((memoria_atual - memoria_antes) / 2**20, 3),
+            "residente_mb": memoria_residente_mb(),
+            "pico_processo_mb": pico_memoria_mb(),
+        }
+        if model is not None:
+            proto = model.Proto()
+            registro["variaveis"] = len(proto.variables) - contagem[0]
+            registro["restricoes"] = len(proto.constraints) - contagem[1]
+        self.fases.append(registro)
+
+    @contextmanager
+    def fase(self, nome, model=None):
+        self.iniciar(nome, model)
+        try:
+            yield
+        finally:
+            self.encerrar()
+
+    def relatorio(self):
+        return {
+            "fases": self.fases,
+            "tempo_total_s": round(time.perf_counter() - self._inicio, 4),
+            "residente_mb": memoria_residente_mb(),
+            "pico_processo_mb": pico_memoria_mb(),
+        }
+
+    def salvar(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.relatorio(), f, ensure_ascii=False, indent=2)
+
+    def imprimir(self):
+        print(f"\n{'Fase':<28} {'Tempo (s)':>10} {'Pico Py (MB)':>13} {'Variáveis':>10} {'Restrições':>11}")
+        for r in self.fases:
+            print(f"{r['fase']:<28} {r['tempo_s']:>10.4f} {r['pico_python_mb']:>13.2f} "
+                  f"{r.get('variaveis', ''):>10} {r.get('restricoes', ''):>11}")
+
+
+def fase(perfil, nome, model=None):
+    """Atalho para medir uma fase só quando há um perfil ativo (sem perfil, não faz nada)."""
+    return perfil.fase(nome, model) if perfil is not None else nullcontext()
+
+
+def proxima_fase(perfil, nome, model=None):
+    """Encerra a fase aberta e inicia a próxima, quando há um perfil ativo."""
+    if perfil is not None:
+        perfil.iniciar(nome, model)
+
+
+def encerrar_fase(perfil):
+    if perfil is not None:
+        perfil.encerrar()
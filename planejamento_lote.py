@@ -0,0 +1,157 @@
+# planejamento_lote.py
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from compilacao import carregar_dados_compilados
+from data_loader import CHAVES_CATEGORIAS, SEMESTRE_MINIMO_POR_DISCIPLINA, reduzir_turmas
+from heuristica import construir_grade_gulosa
+from optimizer import ConfiguracaoSolver, resolver_grade
+from parametros import (
+    CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS, CREDITOS_MAXIMOS_POR_SEMESTRE, CREDITOS_MINIMOS, NUM_SEMESTRES
+)
+
+# Catálogo carregado uma única vez por processo (preenchido pelo inicializador do pool)
+_catalogo = None
+_parametros = None
+
+
+def preparar_aluno(catalogo, aluno, creditos_minimos):
+    """
+    Monta a instância de um aluno a partir do catálogo compartilhado.
+
+    'aluno' é um dicionário com "cursadas" (IDs já aprovados), "semestre_atual" (o próximo semestre
+    a cursar, contado desde o ingresso) e, opcionalmente, "creditos_aproveitados" ({categoria: créditos}
+    de disciplinas fora do catálogo). As disciplinas cursadas saem do modelo e deixam de ser
+    pré-requisito; os mínimos por categoria são descontados dos créditos já obtidos.
+
+    O semestre 1 do plano é o 'semestre_atual' do aluno: se ele começa em um semestre par, as paridades
+    de oferta são trocadas, e os semestres mínimos (ex: EEWU00) são deslocados. Os índices de horários
+    e turmas do catálogo são compartilhados, sem cópia.
+    Retorna (dados, creditos_minimos_restantes, deslocamento).
+    """
+    cursadas = set(aluno.get("cursadas", []))
+    deslocamento = int(aluno.get("semestre_atual", 1)) - 1
+    inverter_paridade = deslocamento % 2 == 1
+
+    disciplinas = {}
+    for d_id, disc in catalogo["disciplinas"].items():
+        if d_id in cursadas:
+            continue
+        disc = dict(disc, prerequisitos=[p for p in disc.get('prerequisitos', []) if p not in cursadas])
+        semestre_minimo = disc.get('semestre_minimo') or SEMESTRE_MINIMO_POR_DISCIPLINA.get(d_id, 1)
+        if semestre_minimo > 1:
+            disc['semestre_minimo'] = max(1, semestre_minimo - deslocamento)
+        disciplinas[d_id] = disc
+
+    periodos_validos_por_disciplina = {
+        d_id: ({3 - p for p in periodos} if inverter_paridade else periodos)
+        for d_id, periodos in catalogo["periodos_validos_por_disciplina"].items()
+        if d_id in disciplinas
+    }
+
+    aproveitados = aluno.get("creditos_aproveitados", {})
+    creditos_minimos_restantes = {}
+    for categoria, chave in CHAVES_CATEGORIAS:
+        obtidos = sum(int(catalogo["disciplinas"][d_id]['creditos']) for d_id in catalogo[chave] if d_id in cursadas)
+        creditos_minimos_restantes[categoria] = max(0, creditos_minimos[categoria] - obtidos - aproveitados.get(categoria, 0))
+
+    dados = dict(catalogo)
+    dados.update({
+        "disciplinas": disciplinas,
+        "turmas_por_disciplina": {d_id: t for d_id, t in catalogo["turmas_por_disciplina"].items() if d_id in disciplinas},
+        "periodos_validos_por_disciplina": periodos_validos_por_disciplina,
+        "eletivas_livres": {d_id: n for d_id, n in catalogo["eletivas_livres"].items() if d_id in disciplinas},
+        "obrigatorias_ids": [d_id for d_id in catalogo["obrigatorias_ids"] if d_id in disciplinas],
+        **{chave: [d_id for d_id in catalogo[chave] if d_id in disciplinas] for _, chave in CHAVES_CATEGORIAS},
+    })
+    return dados, creditos_minimos_restantes, deslocamento
+
+
+def planejar_aluno(catalogo, aluno, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, configuracao=None):
+    """
+    Resolve o plano de um aluno (até NUM_SEMESTRES semestres a partir do atual).
+    Retorna um dicionário com status, semestres restantes, semestre de conclusão, a grade (alocações
+    com o semestre real do aluno) e a latência (s).
+    """
+    inicio = time.perf_counter()
+    dados, creditos_minimos_restantes, deslocamento = preparar_aluno(catalogo, aluno, creditos_minimos)
+    dica = construir_grade_gulosa(dados, creditos_minimos_restantes, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+    grade, creditos, status, obj_value = resolver_grade(
+        dados, creditos_minimos_restantes, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, dica=dica, configuracao=configuracao
+    )
+    return {
+        "id": aluno.get("id"),
+        "status": status.name,
+        "semestres_restantes": obj_value,
+        "semestre_conclusao": deslocamento + obj_value if obj_value is not None else None,
+        "grade": grade.para_dict(deslocamento)["alocacoes"] if grade else None,
+        "creditos_por_semestre": {s + deslocamento: c for s, c in creditos.items() if c} if creditos else None,
+        "latencia_s": round(time.perf_counter() - inicio, 4),
+    }
+
+
+def _inicializar(caminho_disciplinas, caminho_ofertas, parametros):
+    """Inicializador de cada processo do pool: carrega e pré-processa o catálogo uma única vez."""
+    global _catalogo, _parametros
+    _catalogo = reduzir_turmas(carregar_dados_compilados(caminho_disciplinas, caminho_ofertas))
+    _parametros = parametros
+
+
+def _planejar(aluno):
+    return planejar_aluno(_catalogo, aluno, *_parametros)
+
+
+def planejar_lote(alunos, caminho_disciplinas, caminho_ofertas, creditos_minimos, NUM_SEMESTRES,
+                  CREDITOS_MAXIMOS_POR_SEMESTRE, processos=None, configuracao=None):
+    """
+    Planeja um lote de alunos em um pool de processos, cada um com o catálogo carregado uma vez.
+    Gera os resultados (ver 'planejar_aluno') à medida que ficam prontos, fora da ordem de entrada.
+    """
+    parametros = (creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, configuracao)
+    with multiprocessing.Pool(processos, initializer=_inicializar,
+                              initargs=(caminho_disciplinas, caminho_ofertas, parametros)) as pool:
+        yield from pool.imap_unordered(_planejar, alunos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planeja a grade de um lote de alunos com disciplinas já cursadas.")
+    parser.add_argument("alunos", help="Arquivo JSON (lista) ou JSON lines com {id, cursadas, semestre_atual}")
+    parser.add_argument("--saida", default="planos.jsonl", help="Resultados, um aluno por linha (JSON lines)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tempo-limite", type=float, default=30.0, help="Tempo limite do solver por aluno (s)")
+    args = parser.parse_args()
+
+    with open(args.alunos, 'r', encoding='utf-8') as f:
+        conteudo = f.read()
+    try:
+        alunos = json.loads(conteudo)
+    except json.JSONDecodeError:
+        alunos = [json.loads(linha) for linha in conteudo.splitlines() if linha.strip()]
+    if isinstance(alunos, dict):
+        alunos = [alunos]  # JSON lines com um único aluno
+
+    # Um worker do CP-SAT por processo: o paralelismo vem de resolver vários alunos ao mesmo tempo
+    configuracao = ConfiguracaoSolver(num_workers=1, tempo_limite=args.tempo_limite)
+    latencias = []
+    inicio = time.perf_counter()
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        for resultado in planejar_lote(alunos, CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS, CREDITOS_MINIMOS, NUM_SEMESTRES,
+                                       CREDITOS_MAXIMOS_POR_SEMESTRE, processos=args.processos, configuracao=configuracao):
+            f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            latencias.append(resultado["latencia_s"])
+            print(f"{resultado['id']}: {resultado['status']}, conclusão no semestre {resultado['semestre_conclusao']} "
+                  f"({resultado['latencia_s']:.2f} s)")
+    decorrido = time.perf_counter() - inicio
+
+    latencias.sort()
+    if latencias:
+        print(f"\n{len(latencias)} alunos em {decorrido:.2f} s ({len(latencias) / max(decorrido, 1e-9):.2f} alunos/s); "
+              f"latência mediana {latencias[len(latencias) // 2]:.2f} s, máxima {latencias[-1]:.2f} s.")
+    else:
+        print("\n0 alunos: nada a planejar.")
+    print(f"Resultados em '{args.saida}'.")
+
+if __name__ == '__main__':
+    main()
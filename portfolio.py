@@ -0,0 +1,127 @@
+# portfolio.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from ortools.sat.python import cp_model
+from optimizer import resolver_grade
+
+# Variações de parâmetros alternadas entre os membros do portfólio (além da semente)
+VARIACOES_PORTFOLIO = [
+    {},
+    {"linearization_level": 2},
+    {"search_branching": cp_model.PORTFOLIO_SEARCH},
+    {"optimize_with_core": True},
+]
+
+
+def configuracoes_portfolio(base, num_membros):
+    """
+    Gera 'num_membros' configurações a partir de 'base': cada uma com semente própria e uma das
+    VARIACOES_PORTFOLIO, dividindo entre elas os workers da base (ou os núcleos da máquina).
+    """
+    total_workers = base.num_workers or os.cpu_count() or 1
+    workers = max(1, total_workers // num_membros)
+    semente_base = base.semente or 0
+    return [
+        replace(
+            base,
+            num_workers=workers,
+            semente=semente_base + i,
+            extras={**base.extras, **VARIACOES_PORTFOLIO[i % len(VARIACOES_PORTFOLIO)]},
+        )
+        for i in range(num_membros)
+    ]
+
+
+# Sinal compartilhado pelos membros (preenchido pelo inicializador de cada processo)
+_parada = None
+
+
+class ParadaCompartilhada(cp_model.CpSolverSolutionCallback):
+    """
+    Interrompe a busca de um membro quando outro já deu uma resposta definitiva. Tem a interface de
+    'MonitorProgresso' (ver 'progresso.py'), para ser passada a 'resolver_grade' como 'progresso'.
+    """
+
+    def __init__(self, evento):
+        super().__init__()
+        self.evento = evento
+        self._encerrado = threading.Event()
+        self._vigia = None
+
+    def iniciar(self, solver):
+        self._encerrado.clear()
+        self._vigia = threading.Thread(target=self._vigiar, args=(solver,), daemon=True)
+        self._vigia.start()
+
+    def _vigiar(self, solver):
+        # Verifica periodicamente; 'StopSearch' do solver pode ser chamado de outra thread
+        while not self._encerrado.wait(0.05):
+            if self.evento.is_set():
+                solver.StopSearch()
+                return
+
+    def on_solution_callback(self):
+        pass
+
+    def encerrar(self, status):
+        self._encerrado.set()
+        self._vigia.join()
+        self._vigia = None
+
+
+def _inicializar(evento):
+    global _parada
+    _parada = evento
+
+
+def _resolver_membro(argumentos):
+    dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, dica, configuracao = argumentos
+    resultado = resolver_grade(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, dica=dica,
+                               configuracao=configuracao, progresso=ParadaCompartilhada(_parada))
+    if resultado[2] in (cp_model.OPTIMAL, cp_model.INFEASIBLE):
+        _parada.set()  # resposta definitiva: os outros membros podem parar
+    return resultado
+
+
+def _chave_resultado(resultado):
+    """Ordena resultados do melhor para o pior: ótimo provado, depois viável de menor objetivo."""
+    _, _, status, obj_value = resultado
+    if status == cp_model.OPTIMAL:
+        return (0, obj_value)
+    if status == cp_model.FEASIBLE:
+        return (1, obj_value)
+    if status == cp_model.INFEASIBLE:
+        return (2, 0)  # infactibilidade provada também é uma resposta definitiva
+    return (3, 0)
+
+
+def resolver_portfolio(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, configuracoes, dica=None):
+    """
+    Resolve o mesmo modelo com várias configurações em paralelo (um processo por configuração)
+    e fica com o melhor plano. Assim que um membro prova o ótimo (ou a infactibilidade), os demais
+    são interrompidos. Retorna os resultados no mesmo formato de 'resolver_grade'.
+    """
+    parada = multiprocessing.Event()
+    resultados = []
+    with ProcessPoolExecutor(max_workers=len(configuracoes), initializer=_inicializar, initargs=(parada,)) as executor:
+        membros = {
+            executor.submit(_resolver_membro, (dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE,
+                                               dica, configuracao)): i
+            for i, configuracao in enumerate(configuracoes)
+        }
+        for futuro in as_completed(membros):
+            resultado = futuro.result()
+            resultados.append(resultado)
+            _, _, status, obj_value = resultado
+            configuracao = configuracoes[membros[futuro]]
+            print(f"Portfólio {membros[futuro]}: semente={configuracao.semente}, extras={configuracao.extras} -> {status.name}"
+                  + (f" ({obj_value:g} semestres)" if obj_value is not None else ""))
+            if status in (cp_model.OPTIMAL, cp_model.INFEASIBLE):
+                parada.set()
+                for outro in membros:
+                    outro.cancel()  # os que ainda não começaram
+
+    return min(resultados, key=_chave_resultado)
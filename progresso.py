@@ -0,0 +1,81 @@
+# progresso.py
+import json
+import threading
+import time
+from ortools.sat.python import cp_model
+
+
+class MonitorProgresso(cp_model.CpSolverSolutionCallback):
+    """
+    Callback de solução do CP-SAT que emite o progresso da otimização como JSON lines.
+
+    A cada solução que melhora o objetivo, emite {"evento": "solucao", "tempo_s", "objetivo", "limite", "gap"}
+    para 'destino', que pode ser um arquivo (ex: sys.stdout) ou uma função que recebe o dicionário.
+    Interrompe a busca quando o gap relativo chega a 'gap_parada' ou quando passam 'estagnacao_s'
+    segundos sem nenhuma solução melhor (contados só a partir da primeira solução, para nunca
+    parar sem plano).
+    """
+
+    def __init__(self, destino, gap_parada=None, estagnacao_s=None):
+        super().__init__()
+        self.destino = destino
+        self.gap_parada = gap_parada
+        self.estagnacao_s = estagnacao_s
+        self.num_solucoes = 0
+        self._solver = None
+        self._inicio = None
+        self._ultima_melhora = None
+        self._encerrado = threading.Event()
+        self._vigia = None
+
+    def emitir(self, registro):
+        if callable(self.destino):
+            self.destino(registro)
+        else:
+            self.destino.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            self.destino.flush()
+
+    def iniciar(self, solver):
+        """Chamado antes de 'solver.Solve': marca o início e liga o vigia de estagnação, se houver."""
+        self._solver = solver
+        self._inicio = self._ultima_melhora = time.perf_counter()
+        self._encerrado.clear()
+        if self.estagnacao_s is not None:
+            self._vigia = threading.Thread(target=self._vigiar_estagnacao, daemon=True)
+            self._vigia.start()
+
+    def _vigiar_estagnacao(self):
+        # Verifica periodicamente; 'StopSearch' do solver pode ser chamado de outra thread
+        while not self._encerrado.wait(min(0.1, self.estagnacao_s)):
+            if self.num_solucoes and time.perf_counter() - self._ultima_melhora >= self.estagnacao_s:
+                self.emitir({"evento": "parada", "motivo": "estagnacao", "tempo_s": self._decorrido()})
+                self._solver.StopSearch()
+                return
+
+    def _decorrido(self):
+        return round(time.perf_counter() - self._inicio, 4)
+
+    def on_solution_callback(self):
+        self.num_solucoes += 1
+        self._ultima_melhora = time.perf_counter()
+        objetivo = self.ObjectiveValue()
+        limite = self.BestObjectiveBound()
+        gap = abs(objetivo - limite) / max(1.0, abs(objetivo))
+        self.emitir({
+            "evento": "solucao", "tempo_s": self._decorrido(),
+            "objetivo": objetivo, "limite": limite, "gap": round(gap, 6),
+        })
+        if self.gap_parada is not None and gap <= self.gap_parada:
+            self.emitir({"evento": "parada", "motivo": "gap", "tempo_s": self._decorrido()})
+            self.StopSearch()
+
+    def encerrar(self, status):
+        """Chamado depois de 'solver.Solve': desliga o vigia e emite o status final."""
+        self._encerrado.set()
+        if self._vigia is not None:
+            self._vigia.join()
+            self._vigia = None
+        self.emitir({
+            "evento": "fim", "tempo_s": self._decorrido(), "status": self._solver.StatusName(status),
+            "solucoes": self.num_solucoes,
+        })
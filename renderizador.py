@@ -0,0 +1,392 @@
+# renderizador.py
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from html import escape
+from resultado import PlanoGrade
+
+TAMANHO_BUFFER = 1 << 20  # bytes do buffer de escrita dos arquivos agregados (json, csv)
+ARQUIVO_ESTILO = "grade.css"
+FORMATOS = ("html", "json", "csv", "ics")
+
+DIAS = ["SEG", "TER", "QUA", "QUI", "SEX"]
+DIAS_DISPLAY = {"SEG": "Segunda-feira", "TER": "Terça-feira", "QUA": "Quarta-feira", "QUI": "Quinta-feira", "SEX": "Sexta-feira"}
+SLOTS_PADRAO = ["08-10", "10-12", "13-15", "15-17"]
+SLOTS_DISPLAY = {
+    "08-10": "08:00 - 10:00", "10-12": "10:00 - 12:00",
+    "13-15": "13:00 - 15:00", "15-17": "15:00 - 17:00"
+}
+
+# Calendário (iCalendar): dia da semana de cada sigla e duração de cada semestre
+DIAS_ICS = {"SEG": (0, "MO"), "TER": (1, "TU"), "QUA": (2, "WE"), "QUI": (3, "TH"), "SEX": (4, "FR"), "SAB": (5, "SA")}
+SEMANAS_POR_SEMESTRE = 26  # do início de um semestre ao início do seguinte
+SEMANAS_LETIVAS = 15
+
+ESTILO_CSS = """
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+    margin: 0;
+    padding: 2em;
+    background-color: #f8f9fa;
+    color: #212529;
+}
+.container {
+    max-width: 1200px;
+    margin: auto;
+}
+h1 {
+    color: #003366;
+    text-align: center;
+    border-bottom: 3px solid #003366;
+    padding-bottom: 10px;
+}
+h2 {
+    color: #343a40;
+    border-bottom: 2px solid #dee2e6;
+    padding-bottom: 8px;
+    margin-top: 50px;
+}
+table.grade-semanal {
+    border-collapse: collapse;
+    width: 100%;
+    margin-top: 20px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+    table-layout: fixed;
+}
+.grade-semanal th, .grade-semanal td {
+    border: 1px solid #dee2e6;
+    padding: 10px;
+    text-align: center;
+    height: 80px;
+    vertical-align: top;
+}
+.grade-semanal thead {
+    background-color: #003366;
+    color: white;
+}
+.grade-semanal tbody tr:nth-child(even) {
+    background-color: #fdfdfd;
+}
+.grade-semanal td.horario-label {
+    font-weight: bold;
+    background-color: #f8f9fa;
+    width: 12%;
+}
+.materia-cell {
+    background-color: #e7f5ff;
+    font-size: 0.9em;
+    line-height: 1.4;
+}
+.materia-cell small {
+    color: #555;
+}
+.notas {
+    margin-top: 15px;
+    padding: 10px;
+    background-color: #fffbe6;
+    border-left: 4px solid #ffc107;
+}
+"""
+
+CABECALHO_TABELA = (
+    "<table class='grade-semanal'><thead><tr><th>Horário</th>"
+    + "".join(f"<th>{DIAS_DISPLAY[dia]}</th>" for dia in DIAS)
+    + "</tr></thead><tbody>"
+)
+
+
+def partes_horario(horario, dados=None):
+    """Retorna (dia, faixa) de um horário como "SEG-08-10", ou None se o formato for irregular."""
+    if dados is not None and horario in dados["indice_horario"]:
+        return dados["partes_horario"][dados["indice_horario"][horario]]
+    partes = horario.split('-')
+    return (partes[0], f"{partes[1]}-{partes[2]}") if len(partes) == 3 else None
+
+
+def partes_do_plano(plano, dados=None):
+    """Partes (dia, faixa) de cada índice da tabela de horários do plano (as do 'data_loader', se for a mesma tabela)."""
+    if dados is not None and plano.horarios is dados["horarios"]:
+        return dados["partes_horario"]
+    return [partes_horario(h) for h in plano.horarios]
+
+
+class _PartesPorTabela:
+    """Partes (dia, faixa) de cada índice, calculadas uma vez por tabela de horários (compartilhada entre planos)."""
+
+    def __init__(self, dados=None):
+        self._dados = dados
+        self._tabela, self._partes = None, None
+
+    def __call__(self, plano):
+        if plano.horarios is not self._tabela:
+            self._tabela = plano.horarios
+            self._partes = partes_do_plano(plano, self._dados)
+        return self._partes
+
+
+# --- HTML ---
+
+@lru_cache(maxsize=1 << 16)
+def _celula_html(nome, turma_id):
+    # Muitos planos repetem as mesmas turmas: o conteúdo escapado de cada célula é montado uma vez
+    return f"<b>{escape(nome)}</b><br><small>({escape(turma_id)})</small>"
+
+
+def renderizar_html(plano, f, titulo="Grade Horária Otimizada", partes_por_indice=None, estilo=ARQUIVO_ESTILO):
+    """
+    Escreve a página HTML de um PlanoGrade em 'f' (uma única escrita por página).
+    'estilo' é o caminho da folha de estilo compartilhada, ou None para embutir o CSS na página.
+    """
+    if partes_por_indice is None:
+        partes_por_indice = partes_do_plano(plano)
+    creditos = plano.creditos_por_semestre()
+
+    pedacos = ["<html>\n<head>\n<meta charset='utf-8'>\n<title>", escape(titulo), "</title>\n"]
+    if estilo is None:
+        pedacos += ["<style>", ESTILO_CSS, "</style>\n"]
+    else:
+        pedacos += ["<link rel='stylesheet' href='", escape(estilo), "'>\n"]
+    pedacos += ["</head>\n<body>\n<div class='container'>\n<h1>", escape(titulo), "</h1>\n"]
+
+    for s, alocacoes in plano.por_semestre().items():
+        if not alocacoes:
+            continue
+        pedacos.append(f"<h2>Semestre {s} (Créditos: {creditos[s]})</h2>\n")
+
+        # Preenche as células (faixa, dia) e separa os horários fora da grade padrão
+        celulas = {}
+        horarios_nao_padrao = set()
+        for a in alocacoes:
+            conteudo = _celula_html(a.nome, a.turma_id)
+            for i in a.horarios_idx:
+                partes = partes_por_indice[i]
+                if partes is not None and partes[0] in DIAS_DISPLAY and partes[1] in SLOTS_DISPLAY:
+                    celulas[partes] = conteudo
+                else:
+                    horarios_nao_padrao.add(f"{a.nome} ({a.turma_id}): {plano.horarios[i]}")
+
+        pedacos.append(CABECALHO_TABELA)
+        for slot in SLOTS_PADRAO:
+            pedacos.append(f"<tr><td class='horario-label'>{SLOTS_DISPLAY[slot]}</td>")
+            for dia in DIAS:
+                conteudo = celulas.get((dia, slot))
+                pedacos.append(f"<td class='materia-cell'>{conteudo}</td>" if conteudo else "<td class=''></td>")
+            pedacos.append("</tr>")
+        pedacos.append("</tbody></table>\n")
+
+        # Se houver horários não padronizados, lista-os abaixo da tabela
+        if horarios_nao_padrao:
+            pedacos.append("<div class='notas'><strong>Horários não padronizados ou com formato irregular:</strong><ul>")
+            pedacos += [f"<li>{escape(item)}</li>" for item in sorted(horarios_nao_padrao)]
+            pedacos.append("</ul></div>\n")
+
+    pedacos.append("</div></body></html>\n")
+    f.write("".join(pedacos))
+
+
+# --- JSON / CSV ---
+
+CAMPOS_CSV = ["plano", "semestre", "disciplina_id", "nome", "turma_id", "creditos", "horarios"]
+
+
+def exportar_json(nome, plano, f):
+    """Escreve o plano como uma linha JSON (JSON lines: um plano por linha)."""
+    f.write(json.dumps({"plano": nome, **plano.para_dict()}, ensure_ascii=False))
+    f.write("\n")
+
+
+def exportar_csv(nome, plano, escritor):
+    """Escreve uma linha por alocação no 'csv.writer' informado (o cabeçalho é CAMPOS_CSV)."""
+    escritor.writerows(
+        (nome, a.semestre, a.disciplina_id, a.nome, a.turma_id, a.creditos, " ".join(plano.textos_horarios(a)))
+        for a in plano
+    )
+
+
+# --- iCalendar ---
+
+def _texto_ics(texto):
+    return texto.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _dobrar_linha_ics(linha):
+    """Quebra linhas com mais de 75 octetos, como pede a RFC 5545 (continuação começa com espaço)."""
+    if len(linha.encode("utf-8")) <= 75:
+        return linha
+    partes, atual = [], ""
+    for c in linha:
+        if len((atual + c).encode("utf-8")) > 74:
+            partes.append(atual)
+            atual = c
+        else:
+            atual += c
+    partes.append(atual)
+    return "\r\n ".join(partes)
+
+
+class ExportadorICS:
+    """
+    Escreve planos como calendários iCalendar: um evento semanal (SEMANAS_LETIVAS repetições) por
+    horário de cada turma. O semestre 1 começa na semana de 'data_inicio'; cada semestre seguinte,
+    SEMANAS_POR_SEMESTRE semanas depois. Horários fora do formato DIA-HH-HH não entram no calendário.
+
+    O corpo de cada evento (tudo menos o UID) só depende da turma, do semestre e do horário: é montado
+    uma vez e reaproveitado por todos os planos do lote que usam a mesma turma no mesmo semestre.
+    """
+
+    def __init__(self, data_inicio, carimbo=None):
+        self.segunda = data_inicio - timedelta(days=data_inicio.weekday())
+        self.carimbo = carimbo or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self._eventos = {}
+
+    def _evento(self, a, horario, partes):
+        chave = (a.disciplina_id, a.nome, a.turma_id, a.semestre, a.creditos, horario)
+        evento = self._eventos.get(chave, False)
+        if evento is not False:
+            return evento
+
+        evento = None
+        if partes is not None and partes[0] in DIAS_ICS:
+            try:
+                hora_inicio, hora_fim = (int(h) for h in partes[1].split('-'))
+            except ValueError:
+                hora_inicio = None
+            if hora_inicio is not None:
+                dia_semana, sigla = DIAS_ICS[partes[0]]
+                dia = self.segunda + timedelta(weeks=(a.semestre - 1) * SEMANAS_POR_SEMESTRE, days=dia_semana)
+                evento = "\r\n".join([
+                    f"DTSTAMP:{self.carimbo}",
+                    f"DTSTART:{dia:%Y%m%d}T{hora_inicio:02d}0000",
+                    f"DTEND:{dia:%Y%m%d}T{hora_fim:02d}0000",
+                    f"RRULE:FREQ=WEEKLY;COUNT={SEMANAS_LETIVAS};BYDAY={sigla}",
+                    _dobrar_linha_ics(f"SUMMARY:{_texto_ics(f'{a.nome} ({a.turma_id})')}"),
+                    _dobrar_linha_ics(f"DESCRIPTION:{_texto_ics(f'{a.disciplina_id}, semestre {a.semestre}, {a.creditos} créditos')}"),
+                    "END:VEVENT",
+                ])
+        self._eventos[chave] = evento
+        return evento
+
+    def escrever(self, nome, plano, f, partes_por_indice=None):
+        if partes_por_indice is None:
+            partes_por_indice = partes_do_plano(plano)
+        uid = str(nome).replace(" ", "_")
+
+        linhas = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//timetabling-ECI//grade//PT", "CALSCALE:GREGORIAN",
+                  _dobrar_linha_ics(f"X-WR-CALNAME:{_texto_ics(str(nome))}")]
+        for a in plano:
+            for i in a.horarios_idx:
+                evento = self._evento(a, plano.horarios[i], partes_por_indice[i])
+                if evento is not None:
+                    linhas.append(f"BEGIN:VEVENT\r\nUID:{uid}-{a.turma_id}-{a.semestre}-{i}@timetabling-eci\r\n{evento}")
+        linhas.append("END:VCALENDAR\r\n")
+        f.write("\r\n".join(linhas))
+
+
+# --- Lote ---
+
+def _nome_arquivo(nome):
+    return re.sub(r'[^\w.-]', '_', str(nome)) or "plano"
+
+
+def gravar_estilo(diretorio):
+    """Grava a folha de estilo compartilhada por todas as páginas HTML do diretório."""
+    with open(os.path.join(diretorio, ARQUIVO_ESTILO), 'w', encoding='utf-8') as f:
+        f.write(ESTILO_CSS)
+
+
+def renderizar_lote(planos, diretorio, formatos=("html",), data_inicio=None, dados=None):
+    """
+    Renderiza muitos planos em uma única passada. 'planos' é um iterável (pode ser um gerador) de
+    (nome, PlanoGrade). Em 'diretorio' ficam:
+
+    - html: uma página por plano, todas com a mesma folha de estilo 'grade.css';
+    - ics: um calendário por plano (ver 'ExportadorICS');
+    - json: 'planos.jsonl', um plano por linha;
+    - csv: 'planos.csv', uma linha por alocação de cada plano.
+
+    Cada página e calendário sai em uma única escrita; os arquivos agregados (json, csv) passam por um
+    buffer grande. Os planos não são mantidos em memória.
+    Retorna o número de planos renderizados.
+    """
+    formatos = set(formatos)
+    desconhecidos = formatos - set(FORMATOS)
+    if desconhecidos:
+        raise ValueError(f"Formatos desconhecidos: {', '.join(sorted(desconhecidos))} (use {', '.join(FORMATOS)}).")
+    os.makedirs(diretorio, exist_ok=True)
+    if "html" in formatos:
+        gravar_estilo(diretorio)
+    exportador_ics = ExportadorICS(data_inicio or date.today())
+    partes = _PartesPorTabela(dados)
+
+    def abrir(nome_arquivo, **opcoes):
+        return open(os.path.join(diretorio, nome_arquivo), 'w', encoding='utf-8', **opcoes)
+
+    arquivo_json = abrir("planos.jsonl", buffering=TAMANHO_BUFFER) if "json" in formatos else None
+    arquivo_csv = abrir("planos.csv", buffering=TAMANHO_BUFFER, newline='') if "csv" in formatos else None
+    escritor_csv = None
+    if arquivo_csv is not None:
+        escritor_csv = csv.writer(arquivo_csv)
+        escritor_csv.writerow(CAMPOS_CSV)
+
+    total = 0
+    try:
+        for nome, plano in planos:
+            partes_por_indice = partes(plano)
+            base = _nome_arquivo(nome)
+            if "html" in formatos:
+                with abrir(f"{base}.html") as f:
+                    renderizar_html(plano, f, titulo=f"Grade Horária: {nome}", partes_por_indice=partes_por_indice)
+            if "ics" in formatos:
+                with abrir(f"{base}.ics", newline='') as f:
+                    exportador_ics.escrever(nome, plano, f, partes_por_indice)
+            if arquivo_json is not None:
+                exportar_json(nome, plano, arquivo_json)
+            if escritor_csv is not None:
+                exportar_csv(nome, plano, escritor_csv)
+            total += 1
+    finally:
+        for arquivo in (arquivo_json, arquivo_csv):
+            if arquivo is not None:
+                arquivo.close()
+    return total
+
+
+def ler_planos(caminho):
+    """
+    Lê planos em JSON lines: a saída de 'planejamento_lote.py' ({id, grade: [alocações]}) ou de
+    'renderizador.py' com o formato json ({plano, num_semestres, alocacoes}). Gera (nome, PlanoGrade).
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for numero, linha in enumerate(f, start=1):
+            if not linha.strip():
+                continue
+            entrada = json.loads(linha)
+            if "alocacoes" in entrada:
+                yield entrada.get("plano", numero), PlanoGrade.de_dict(entrada)
+            elif entrada.get("grade"):
+                alocacoes = entrada["grade"]
+                num_semestres = max(a["semestre"] for a in alocacoes)
+                yield entrada.get("id", numero), PlanoGrade.de_dict({"alocacoes": alocacoes, "num_semestres": num_semestres})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Renderiza um lote de planos em HTML, JSON, CSV e iCalendar.")
+    parser.add_argument("planos", help="Planos em JSON lines (ex: a saída de 'planejamento_lote.py')")
+    parser.add_argument("--saida", default="planos_renderizados", help="Diretório de saída")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=["html"])
+    parser.add_argument("--inicio", type=date.fromisoformat, default=None,
+                        help="Data de início do semestre 1 para o iCalendar (AAAA-MM-DD; padrão: hoje)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    total = renderizar_lote(ler_planos(args.planos), args.saida, args.formatos, data_inicio=args.inicio)
+    decorrido = time.perf_counter() - inicio
+    print(f"{total} planos renderizados em {decorrido:.2f} s ({', '.join(args.formatos)}) em '{args.saida}'.")
+
+if __name__ == '__main__':
+    main()
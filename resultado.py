@@ -0,0 +1,92 @@
+# resultado.py
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AlocacaoTurma:
+    """
+    Uma disciplina do plano: semestre, turma, créditos e os índices dos horários da turma
+    (posições em 'horarios' do índice de 'data_loader'). Imutável e comparável por valor (hashable).
+    """
+    # Declarados à mão: 'dataclass(slots=True)' só existe a partir do Python 3.10
+    __slots__ = ("disciplina_id", "nome", "turma_id", "semestre", "creditos", "horarios_idx")
+
+    disciplina_id: str
+    nome: str
+    turma_id: str
+    semestre: int
+    creditos: int
+    horarios_idx: tuple
+
+    def __post_init__(self):
+        object.__setattr__(self, "horarios_idx", tuple(self.horarios_idx))
+
+    def __repr__(self):
+        return f"AlocacaoTurma({self.disciplina_id!r}, turma={self.turma_id!r}, semestre={self.semestre})"
+
+
+class PlanoGrade:
+    """
+    Grade resolvida: as alocações, ordenadas por semestre e nome, e a tabela de horários (texto de cada
+    índice) a que elas se referem. A tabela é a do 'data_loader', compartilhada e não copiada.
+    """
+    __slots__ = ("alocacoes", "horarios", "NUM_SEMESTRES")
+
+    def __init__(self, alocacoes, horarios, NUM_SEMESTRES):
+        self.alocacoes = sorted(alocacoes, key=lambda a: (a.semestre, a.nome, a.turma_id))
+        self.horarios = horarios
+        self.NUM_SEMESTRES = NUM_SEMESTRES
+
+    def __iter__(self):
+        return iter(self.alocacoes)
+
+    def __len__(self):
+        return len(self.alocacoes)
+
+    def textos_horarios(self, alocacao):
+        """Horários da alocação em texto (ex: "SEG-08-10")."""
+        return [self.horarios[i] for i in alocacao.horarios_idx]
+
+    def por_semestre(self):
+        """{semestre: [AlocacaoTurma]} para os semestres 1..NUM_SEMESTRES (vazios inclusive)."""
+        semestres = {s: [] for s in range(1, self.NUM_SEMESTRES + 1)}
+        for alocacao in self.alocacoes:
+            semestres[alocacao.semestre].append(alocacao)
+        return semestres
+
+    def creditos_por_semestre(self):
+        creditos = {s: 0 for s in range(1, self.NUM_SEMESTRES + 1)}
+        for alocacao in self.alocacoes:
+            creditos[alocacao.semestre] += alocacao.creditos
+        return creditos
+
+    def para_dict(self, deslocamento=0):
+        """
+        Forma JSON: a lista de alocações com os horários em texto. 'deslocamento' soma-se aos
+        semestres (ex: semestre real de um aluno que já cursou parte do currículo).
+        """
+        return {
+            "num_semestres": self.NUM_SEMESTRES + deslocamento,
+            "alocacoes": [
+                {
+                    "disciplina_id": a.disciplina_id, "nome": a.nome, "turma_id": a.turma_id,
+                    "semestre": a.semestre + deslocamento, "creditos": a.creditos, "horarios": self.textos_horarios(a),
+                }
+                for a in self.alocacoes
+            ],
+        }
+
+    @classmethod
+    def de_dict(cls, entrada):
+        """Reconstrói um plano gravado por 'para_dict' (com uma tabela de horários própria)."""
+        horarios, indice = [], {}
+        alocacoes = []
+        for a in entrada["alocacoes"]:
+            idx = []
+            for h in a["horarios"]:
+                if h not in indice:
+                    indice[h] = len(horarios)
+                    horarios.append(h)
+                idx.append(indice[h])
+            alocacoes.append(AlocacaoTurma(a["disciplina_id"], a["nome"], a["turma_id"], a["semestre"], a["creditos"], idx))
+        return cls(alocacoes, horarios, entrada["num_semestres"])
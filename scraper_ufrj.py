@@ -1,7 +1,21 @@
+import argparse
+import hashlib
 import json
+import multiprocessing
+import os
 import re
+import time
 from bs4 import BeautifulSoup
 
+# Backend do BeautifulSoup: o lxml (em C) é bem mais rápido; sem ele, usa o parser puro Python da biblioteca padrão
+try:
+    import lxml  # noqa: F401
+    PARSER_HTML = "lxml"
+except ImportError:
+    PARSER_HTML = "html.parser"
+
+MANIFESTO = "manifesto_scraping.json"
+
 def extrair_prerequisitos(td_requisitos):
     """
     Função auxiliar para extrair e limpar os códigos dos pré-requisitos.
@@ -27,15 +41,23 @@ def analisar_html_grade(caminho_arquivo):
     print(f"Lendo o arquivo HTML: {caminho_arquivo}")
     with open(caminho_arquivo, 'r', encoding='utf-8') as f:
         conteudo = f.read()
+    return analisar_conteudo_grade(conteudo)
+
 
-    soup = BeautifulSoup(conteudo, 'html.parser')
+def analisar_conteudo_grade(conteudo, verboso=True):
+    """
+    Extrai as disciplinas do HTML de uma grade curricular, no esquema lido por 'data_loader':
+    uma lista de {"id", "nome", "creditos", "prerequisitos", "tipo"}.
+    """
+    soup = BeautifulSoup(conteudo, PARSER_HTML)
 
     # Identificamos que todas as tabelas de disciplinas possuem uma linha de cabeçalho
     # com a classe 'tableTitleBlue'. Vamos encontrar todas elas.
     tabelas_de_periodos = soup.find_all('table', class_='cellspacingTable')
     
     disciplinas_extraidas = []
-    print(f"Analisando {len(tabelas_de_periodos)} tabelas encontradas...")
+    if verboso:
+        print(f"Analisando {len(tabelas_de_periodos)} tabelas encontradas...")
 
     for tabela in tabelas_de_periodos:
         # Pega o título da tabela (ex: "1º Período", "Disciplinas Optativas")
@@ -91,11 +113,100 @@ def salvar_em_json(dados, nome_arquivo):
     print(f"\nSucesso! {len(dados)} disciplinas foram extraídas e salvas em '{nome_arquivo}'.")
 
 
+def _sha256(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def _processar_pagina(tarefa):
+    """Extrai uma página e grava '<destino>/disciplinas.json'. Executada nos processos do pool."""
+    caminho_html, destino = tarefa
+    try:
+        with open(caminho_html, 'rb') as f:
+            conteudo = f.read()
+        disciplinas = analisar_conteudo_grade(conteudo.decode('utf-8'), verboso=False)
+        os.makedirs(destino, exist_ok=True)
+        temporario = os.path.join(destino, "disciplinas.json.tmp")
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(disciplinas, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, os.path.join(destino, "disciplinas.json"))
+        return caminho_html, _sha256(conteudo), len(disciplinas), None
+    except (OSError, UnicodeDecodeError) as e:
+        return caminho_html, None, 0, f"{type(e).__name__}: {e}"
+
+
+def atualizar_curriculos(diretorio_html, diretorio_saida, processos=None, forcar=False):
+    """
+    Extrai todas as páginas '.html' de 'diretorio_html' em um pool de processos. Cada página gera
+    '<diretorio_saida>/<nome da página>/disciplinas.json' (o diretório de um conjunto de dados, ao lado
+    do 'ofertas.json'). O manifesto em 'diretorio_saida' guarda o SHA-256 de cada página: páginas
+    inalteradas, cuja saída ainda existe, são puladas (a menos que 'forcar' seja True).
+    Retorna {"extraidas", "inalteradas", "erros"}.
+    """
+    caminho_manifesto = os.path.join(diretorio_saida, MANIFESTO)
+    try:
+        with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+            manifesto = json.load(f)
+    except (OSError, ValueError):
+        manifesto = {}
+
+    paginas = sorted(
+        nome for nome in os.listdir(diretorio_html) if nome.lower().endswith(('.html', '.htm'))
+    )
+    pendentes, inalteradas = [], []
+    for nome in paginas:
+        caminho_html = os.path.join(diretorio_html, nome)
+        destino = os.path.join(diretorio_saida, os.path.splitext(nome)[0])
+        with open(caminho_html, 'rb') as f:
+            hash_atual = _sha256(f.read())
+        if not forcar and manifesto.get(nome) == hash_atual and os.path.exists(os.path.join(destino, "disciplinas.json")):
+            inalteradas.append(nome)
+        else:
+            pendentes.append((caminho_html, destino))
+
+    extraidas, erros = {}, {}
+    if pendentes:
+        os.makedirs(diretorio_saida, exist_ok=True)
+        with multiprocessing.Pool(min(processos or os.cpu_count() or 1, len(pendentes))) as pool:
+            for caminho_html, hash_pagina, num_disciplinas, erro in pool.imap_unordered(_processar_pagina, pendentes):
+                nome = os.path.basename(caminho_html)
+                if erro:
+                    erros[nome] = erro
+                    manifesto.pop(nome, None)
+                else:
+                    extraidas[nome] = num_disciplinas
+                    manifesto[nome] = hash_pagina
+
+        with open(caminho_manifesto, 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    return {"extraidas": extraidas, "inalteradas": inalteradas, "erros": erros}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extrai as disciplinas de páginas de grade curricular da UFRJ.")
+    parser.add_argument("entrada", nargs="?", default="htmlSiga.html",
+                        help="Uma página HTML ou um diretório de páginas (uma por currículo)")
+    parser.add_argument("--saida", default=None,
+                        help="Arquivo JSON (para uma página; padrão: disciplinas.json) ou diretório dos "
+                             "conjuntos de dados (para um diretório; padrão: o próprio diretório de entrada)")
+    parser.add_argument("--processos", type=int, default=None, help="Processos do pool (padrão: número de núcleos)")
+    parser.add_argument("--forcar", action="store_true", help="Extrai de novo mesmo as páginas inalteradas")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.entrada):
+        disciplinas = analisar_html_grade(args.entrada)
+        if disciplinas:
+            salvar_em_json(disciplinas, args.saida or "disciplinas.json")
+        return
+
+    inicio = time.perf_counter()
+    resumo = atualizar_curriculos(args.entrada, args.saida or args.entrada, args.processos, args.forcar)
+    for nome, erro in sorted(resumo["erros"].items()):
+        print(f"Erro em '{nome}': {erro}")
+    print(f"{len(resumo['extraidas'])} páginas extraídas, {len(resumo['inalteradas'])} inalteradas, "
+          f"{len(resumo['erros'])} com erro em {time.perf_counter() - inicio:.2f} s (parser: {PARSER_HTML}).")
+
+
 # --- PONTO DE PARTIDA DO SCRIPT ---
 if __name__ == '__main__':
-    ARQUIVO_HTML = "htmlSiga.html"
-    
-    disciplinas = analisar_html_grade(ARQUIVO_HTML)
-    
-    if disciplinas:
-        salvar_em_json(disciplinas, "disciplinas.json")
\ No newline at end of file
+    main()
@@ -0,0 +1,187 @@
+# sessao.py
+import argparse
+import json
+import sys
+import time
+from ortools.sat.python import cp_model
+from compilacao import carregar_dados_compilados
+from limites import limite_inferior_semestres
+from optimizer import ConfiguracaoSolver, aplicar_dica, construir_modelo, extrair_plano
+from parametros import (
+    CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS, CREDITOS_MAXIMOS_POR_SEMESTRE, CREDITOS_MINIMOS, NUM_SEMESTRES
+)
+
+
+class SessaoGrade:
+    """
+    Responde perguntas do tipo "e se...?" sobre um modelo construído uma única vez.
+
+    Cada edição de cenário (cancelar uma turma, mudar o limite de créditos ou um mínimo de categoria,
+    regras de uma disciplina) só altera domínios de variáveis do modelo parametrizável, e a nova
+    resolução parte da solução anterior como dica. As edições são cumulativas.
+
+    Use os dados de 'carregar_dados' sem 'reduzir_turmas': uma turma descartada por dominância pode
+    voltar a ser necessária quando a turma que a dominava é cancelada.
+    """
+
+    def __init__(self, dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, configuracao=None):
+        inicio = time.perf_counter()
+        self.dados = dados
+        self.NUM_SEMESTRES = NUM_SEMESTRES
+        self.creditos_minimos = dict(creditos_minimos)
+        self.limite_creditos = CREDITOS_MAXIMOS_POR_SEMESTRE
+        self.configuracao = configuracao or ConfiguracaoSolver()
+        self.regras = {}  # d_id -> {"minimo": s, "maximo": s, "cursar": True/False}
+        self.plano = None
+
+        self.modelo = construir_modelo(
+            dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE, parametrizavel=True
+        )
+        self.proto = self.modelo["model"].Proto()
+        # Início da janela de cada disciplina: as regras só podem apertar o domínio a partir dele
+        self.inicio_janela = {
+            d_id: self.proto.variables[var.Index()].domain[0] for d_id, var in self.modelo["semestre_da_disciplina"].items()
+        }
+        self.tempo_construcao = time.perf_counter() - inicio
+
+    def _fixar_dominio(self, var, dominio):
+        """Substitui o domínio da variável no proto por 'dominio' ([min1, max1, min2, max2, ...])."""
+        valores = self.proto.variables[var.Index()].domain
+        valores.clear()
+        valores.extend(dominio)
+
+    def _aplicar_regras(self, d_id):
+        """Recalcula os domínios de semestre e de 'cursada' da disciplina a partir das suas regras."""
+        regras = self.regras.get(d_id, {})
+        nao_cursado = self.NUM_SEMESTRES + 1
+        cursar = regras.get("cursar")
+
+        inicio = max(self.inicio_janela[d_id], regras.get("minimo", 1))
+        fim = min(self.NUM_SEMESTRES, regras.get("maximo", self.NUM_SEMESTRES))
+        dominio = [inicio, fim] if inicio <= fim else []
+        if cursar is False:
+            dominio = [nao_cursado, nao_cursado]
+        elif cursar is not True:
+            # O CP-SAT exige intervalos disjuntos e não adjacentes
+            dominio = [inicio, nao_cursado] if fim == self.NUM_SEMESTRES else dominio + [nao_cursado, nao_cursado]
+        if not dominio:
+            dominio = [nao_cursado, nao_cursado]  # sem semestre possível: a regra exige cursar -> infactível via 'cursada'
+
+        self._fixar_dominio(self.modelo["semestre_da_disciplina"][d_id], dominio)
+        self._fixar_dominio(self.modelo["cursada_vars"][d_id], {True: [1, 1], False: [0, 0]}.get(cursar, [0, 1]))
+
+    def aplicar_edicao(self, edicao):
+        """
+        Aplica uma edição de cenário, dada como dicionário com a chave "tipo":
+          - {"tipo": "cancelar_turma" | "reabrir_turma", "turma": t_id}
+          - {"tipo": "limite_creditos", "valor": n}
+          - {"tipo": "creditos_minimos", "categoria": "restrita" | "condicionada" | "livre", "valor": n}
+          - {"tipo": "semestre_minimo" | "semestre_maximo", "disciplina": d_id, "semestre": s}
+          - {"tipo": "cursar" | "nao_cursar" | "remover_regras", "disciplina": d_id}
+        """
+        tipo = edicao.get("tipo")
+        if tipo in ("cancelar_turma", "reabrir_turma"):
+            t_id = edicao["turma"]
+            if t_id not in self.modelo["turma_ativa"]:
+                raise ValueError(f"Turma '{t_id}' não existe no modelo.")
+            self._fixar_dominio(self.modelo["turma_ativa"][t_id], [0, 0] if tipo == "cancelar_turma" else [0, 1])
+        elif tipo == "limite_creditos":
+            self.limite_creditos = int(edicao["valor"])
+            self._fixar_dominio(self.modelo["limite_creditos"], [self.limite_creditos, self.limite_creditos])
+        elif tipo == "creditos_minimos":
+            categoria = edicao["categoria"]
+            if categoria not in self.modelo["minimos_por_categoria"]:
+                raise ValueError(f"Categoria '{categoria}' desconhecida.")
+            self.creditos_minimos[categoria] = int(edicao["valor"])
+            self._fixar_dominio(self.modelo["minimos_por_categoria"][categoria], [int(edicao["valor"])] * 2)
+        elif tipo in ("semestre_minimo", "semestre_maximo", "cursar", "nao_cursar", "remover_regras"):
+            d_id = edicao["disciplina"]
+            if d_id not in self.modelo["semestre_da_disciplina"]:
+                raise ValueError(f"Disciplina '{d_id}' não existe no modelo.")
+            if tipo == "remover_regras":
+                self.regras.pop(d_id, None)
+            elif tipo in ("cursar", "nao_cursar"):
+                self.regras.setdefault(d_id, {})["cursar"] = tipo == "cursar"
+            else:
+                self.regras.setdefault(d_id, {})[tipo.split("_")[1]] = int(edicao["semestre"])
+            self._aplicar_regras(d_id)
+        else:
+            raise ValueError(f"Tipo de edição desconhecido: {tipo!r}")
+
+    def resolver(self):
+        """
+        Resolve o cenário atual usando a solução anterior como dica.
+        Retorna um dicionário com status, objetivo, tempo (s), plano e as disciplinas cujo
+        (semestre, turma) mudou em relação à solução anterior.
+        """
+        inicio = time.perf_counter()
+        modelo = self.modelo
+        model = modelo["model"]
+
+        # O limite inferior depende do limite de créditos e dos mínimos atuais; entra como domínio do objetivo
+        limite_inferior = limite_inferior_semestres(self.dados, self.creditos_minimos, self.NUM_SEMESTRES, self.limite_creditos)
+        resultado = {"status": "INFEASIBLE", "objetivo": None, "plano": None, "alteracoes": {}}
+        if limite_inferior <= self.NUM_SEMESTRES:
+            self._fixar_dominio(modelo["semestre_maximo"], [limite_inferior, self.NUM_SEMESTRES])
+            model.ClearHints()
+            if self.plano:
+                aplicar_dica(modelo, self.plano)
+
+            solver = cp_model.CpSolver()
+            self.configuracao.aplicar(solver)
+            status = solver.Solve(model)
+            resultado["status"] = solver.StatusName(status)
+
+            if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+                plano = extrair_plano(modelo, solver)
+                anterior = self.plano or {}
+                resultado.update({
+                    "objetivo": solver.ObjectiveValue(),
+                    "plano": plano,
+                    "alteracoes": {
+                        d_id: {"antes": anterior.get(d_id), "depois": plano.get(d_id)}
+                        for d_id in sorted(set(anterior) | set(plano))
+                        if anterior.get(d_id) != plano.get(d_id)
+                    },
+                })
+                self.plano = plano
+
+        resultado["tempo_s"] = round(time.perf_counter() - inicio, 4)
+        return resultado
+
+    def aplicar_cenarios(self, edicoes):
+        """Para cada edição do fluxo, aplica-a e re-resolve; gera um resultado (ver 'resolver') por edição."""
+        for edicao in edicoes:
+            self.aplicar_edicao(edicao)
+            resultado = self.resolver()
+            resultado["edicao"] = edicao
+            yield resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sessão 'e se...?': lê edições de cenário em JSON lines e imprime, para cada uma, "
+                    "o status, o objetivo, o tempo de resolução e as disciplinas que mudaram."
+    )
+    parser.add_argument("cenarios", nargs="?", help="Arquivo com uma edição JSON por linha (padrão: entrada padrão)")
+    parser.add_argument("--tempo-limite", type=float, default=120.0, help="Tempo limite por resolução, em segundos")
+    args = parser.parse_args()
+
+    dados = carregar_dados_compilados(CAMINHO_DISCIPLINAS, CAMINHO_OFERTAS)
+    sessao = SessaoGrade(
+        dados, CREDITOS_MINIMOS, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE,
+        configuracao=ConfiguracaoSolver(tempo_limite=args.tempo_limite)
+    )
+    base = sessao.resolver()
+    print(f"Modelo construído em {sessao.tempo_construcao:.2f} s; cenário base: {base['status']} "
+          f"({base['objetivo']} semestres) em {base['tempo_s']:.2f} s.", file=sys.stderr)
+
+    entrada = open(args.cenarios, 'r', encoding='utf-8') if args.cenarios else sys.stdin
+    with entrada:
+        edicoes = (json.loads(linha) for linha in entrada if linha.strip())
+        for resultado in sessao.aplicar_cenarios(edicoes):
+            resultado.pop("plano")
+            print(json.dumps(resultado, ensure_ascii=False), flush=True)
+
+if __name__ == '__main__':
+    main()
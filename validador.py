@@ -0,0 +1,152 @@
+# validador.py
+from data_loader import BLOCOS_PADRAO, CHAVES_CATEGORIAS, calcular_janelas, disciplinas_cursadas_obrigatoriamente
+from limites import limite_inferior_semestres
+
+
+def componentes_fortemente_conexas(sucessores):
+    """
+    Algoritmo de Tarjan em versão iterativa (sem recursão, para cadeias de qualquer comprimento).
+    'sucessores' é {vertice: [vertices]}; retorna a lista de componentes fortemente conexas.
+    """
+    indice, menor = {}, {}
+    pilha, na_pilha = [], set()
+    componentes = []
+
+    for raiz in sucessores:
+        if raiz in indice:
+            continue
+        indice[raiz] = menor[raiz] = len(indice)
+        pilha.append(raiz)
+        na_pilha.add(raiz)
+        trabalho = [(raiz, iter(sucessores[raiz]))]
+        while trabalho:
+            v, filhos = trabalho[-1]
+            for w in filhos:
+                if w not in indice:
+                    indice[w] = menor[w] = len(indice)
+                    pilha.append(w)
+                    na_pilha.add(w)
+                    trabalho.append((w, iter(sucessores[w])))
+                    break
+                if w in na_pilha:
+                    menor[v] = min(menor[v], indice[w])
+            else:
+                # Todos os filhos de v foram visitados: propaga o 'menor' ao pai e fecha a componente, se v for raiz
+                trabalho.pop()
+                if trabalho:
+                    pai = trabalho[-1][0]
+                    menor[pai] = min(menor[pai], menor[v])
+                if menor[v] == indice[v]:
+                    componente = []
+                    while True:
+                        w = pilha.pop()
+                        na_pilha.discard(w)
+                        componente.append(w)
+                        if w == v:
+                            break
+                    componentes.append(componente)
+    return componentes
+
+
+def validar_dados(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE):
+    """
+    Valida os dados já carregados por 'carregar_dados' antes de montar o modelo.
+    Retorna uma lista de problemas {"nivel": "erro" | "aviso", "verificacao", "mensagem"};
+    qualquer "erro" torna o modelo infactível (ou sem sentido) e deve interromper a execução.
+    """
+    disciplinas = dados["disciplinas"]
+    turmas_por_disciplina = dados["turmas_por_disciplina"]
+    eletivas_livres = dados["eletivas_livres"]
+    sem_oferta = dados.get("disciplinas_sem_oferta", {})
+    problemas = []
+
+    def registrar(nivel, verificacao, mensagem):
+        problemas.append({"nivel": nivel, "verificacao": verificacao, "mensagem": mensagem})
+
+    # --- Pré-requisitos: ciclos (SCC) e IDs pendentes ---
+    sucessores = {d_id: [] for d_id in disciplinas}
+    for d_id, disc in disciplinas.items():
+        for p in disc.get('prerequisitos', []):
+            if p in disciplinas:
+                sucessores[p].append(d_id)
+            elif p in sem_oferta:
+                registrar("aviso", "prerequisitos", f"{d_id}: o pré-requisito {p} não tem oferta e é ignorado pelo modelo.")
+            else:
+                registrar("aviso", "prerequisitos", f"{d_id}: o pré-requisito {p} não existe em 'disciplinas.json'.")
+
+    for componente in componentes_fortemente_conexas(sucessores):
+        if len(componente) > 1 or componente[0] in sucessores[componente[0]]:
+            registrar("erro", "ciclos", "Ciclo de pré-requisitos entre: " + ", ".join(sorted(componente)))
+
+    # --- Turmas ---
+    for t_id in sorted(set(dados.get("turmas_duplicadas", []))):
+        registrar("aviso", "turmas_duplicadas", f"A turma {t_id} aparece mais de uma vez em 'ofertas.json' (só a primeira é usada).")
+
+    cursadas_obrigatoriamente = disciplinas_cursadas_obrigatoriamente(dados)
+    for d_id in disciplinas:
+        if not turmas_por_disciplina.get(d_id) and d_id not in eletivas_livres:
+            nivel = "erro" if d_id in cursadas_obrigatoriamente else "aviso"
+            registrar(nivel, "sem_turmas", f"{d_id} ({disciplinas[d_id]['nome']}) não tem nenhuma turma.")
+    for d_id, tipo in sem_oferta.items():
+        if "Período" in tipo:
+            registrar("aviso", "sem_turmas", f"A obrigatória {d_id} ({tipo}) não tem oferta e fica fora do plano.")
+
+    # --- Alcance de cada disciplina (paridade, cadeia de pré-requisitos, semestre mínimo e horizonte) ---
+    janelas = calcular_janelas(dados, NUM_SEMESTRES)
+    alcancaveis = {d_id for d_id, (inicio, fim) in janelas.items() if inicio <= fim}
+    for d_id in cursadas_obrigatoriamente - alcancaveis:
+        registrar("erro", "alcance", f"{d_id} ({disciplinas[d_id]['nome']}) não cabe em {NUM_SEMESTRES} semestres "
+                                     f"(paridade de oferta, pré-requisitos ou semestre mínimo).")
+
+    # --- Capacidade de créditos por categoria (só disciplinas alcançáveis) ---
+    for categoria, chave in CHAVES_CATEGORIAS:
+        if not dados[chave]:
+            continue  # categoria sem disciplinas ofertadas não gera restrição no modelo
+        disponivel = sum(int(disciplinas[d_id]['creditos']) for d_id in dados[chave] if d_id in alcancaveis)
+        if disponivel < creditos_minimos[categoria]:
+            registrar("erro", "capacidade_categorias",
+                      f"Escolha {categoria}: {disponivel} créditos alcançáveis para um mínimo de {creditos_minimos[categoria]}.")
+
+    # --- Capacidade de horários: blocos semanais das disciplinas obrigatórias, por paridade ---
+    # Horários distintos usados pelas turmas do currículo (o índice pode ser compartilhado com outros currículos)
+    horarios_usados = set(range(len(BLOCOS_PADRAO)))
+    for turmas in turmas_por_disciplina.values():
+        for t_id in turmas:
+            horarios_usados.update(dados["horarios_idx_por_turma"][t_id])
+    blocos_por_semestre = len(horarios_usados)
+    necessarios = {1: 0, 2: 0, None: 0}  # None: oferecidas nos dois períodos
+    for d_id in cursadas_obrigatoriamente & alcancaveis:
+        if d_id in eletivas_livres:
+            blocos = eletivas_livres[d_id]
+        elif turmas_por_disciplina.get(d_id):
+            blocos = min(len(dados["horarios_idx_por_turma"][t_id]) for t_id in turmas_por_disciplina[d_id])
+        else:
+            continue
+        periodos = dados["periodos_validos_por_disciplina"].get(d_id, {1, 2})
+        necessarios[next(iter(periodos)) if len(periodos) == 1 else None] += blocos
+    semestres_por_paridade = {1: (NUM_SEMESTRES + 1) // 2, 2: NUM_SEMESTRES // 2}
+    for paridade in (1, 2):
+        capacidade = semestres_por_paridade[paridade] * blocos_por_semestre
+        if necessarios[paridade] > capacidade:
+            registrar("erro", "capacidade_horarios",
+                      f"As obrigatórias do período {paridade} precisam de {necessarios[paridade]} blocos semanais, "
+                      f"mas só há {capacidade} nos semestres desse período.")
+    if sum(necessarios.values()) > NUM_SEMESTRES * blocos_por_semestre:
+        registrar("erro", "capacidade_horarios",
+                  f"As obrigatórias precisam de {sum(necessarios.values())} blocos semanais, "
+                  f"mas só há {NUM_SEMESTRES * blocos_por_semestre} no horizonte.")
+
+    # --- Horizonte: caminho crítico e volume de créditos ---
+    limite_inferior = limite_inferior_semestres(dados, creditos_minimos, NUM_SEMESTRES, CREDITOS_MAXIMOS_POR_SEMESTRE)
+    if limite_inferior > NUM_SEMESTRES:
+        registrar("erro", "horizonte", f"São necessários pelo menos {limite_inferior} semestres, mas o horizonte é {NUM_SEMESTRES}.")
+
+    return problemas
+
+
+def imprimir_problemas(problemas):
+    """Imprime os problemas encontrados, erros primeiro. Retorna True se houver algum erro."""
+    erros = [p for p in problemas if p["nivel"] == "erro"]
+    for p in erros + [p for p in problemas if p["nivel"] == "aviso"]:
+        print(f"{'❌ ERRO' if p['nivel'] == 'erro' else '⚠️  Aviso'} [{p['verificacao']}] {p['mensagem']}")
+    return bool(erros)
@@ -0,0 +1,118 @@
+# varredura.py
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from compilacao import carregar_dados_compilados
+from data_loader import reduzir_turmas
+from heuristica import construir_grade_gulosa
+from optimizer import ConfiguracaoSolver, resolver_grade
+
+CAMPOS = [
+    "conjunto", "num_semestres", "creditos_maximos", "restrita", "condicionada", "livre",
+    "status", "objetivo", "limite_inferior", "tempo_s", "variaveis", "restricoes", "erro",
+]
+
+# Dados carregados uma única vez por processo (preenchido pelo inicializador do pool)
+_dados_por_conjunto = {}
+_configuracao = None
+
+
+def _inicializar(conjuntos, configuracao):
+    """Inicializador de cada processo do pool: carrega e pré-processa cada conjunto de dados uma vez."""
+    global _configuracao
+    _configuracao = configuracao
+    for conjunto in conjuntos:
+        try:
+            _dados_por_conjunto[conjunto] = reduzir_turmas(carregar_dados_compilados(
+                os.path.join(conjunto, "disciplinas.json"), os.path.join(conjunto, "ofertas.json")
+            ))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Ex: 'attempt2' só tem 'disciplinas.json'; o erro aparece nas linhas desse conjunto
+            _dados_por_conjunto[conjunto] = f"{type(e).__name__}: {e}"
+
+
+def _executar_ponto(ponto):
+    """Resolve um ponto da grade de parâmetros e devolve uma linha do relatório."""
+    conjunto, num_semestres, creditos_maximos, restrita, condicionada, livre = ponto
+    linha = dict.fromkeys(CAMPOS)
+    linha.update({
+        "conjunto": conjunto, "num_semestres": num_semestres, "creditos_maximos": creditos_maximos,
+        "restrita": restrita, "condicionada": condicionada, "livre": livre,
+    })
+
+    dados = _dados_por_conjunto[conjunto]
+    if isinstance(dados, str):
+        linha["erro"] = dados
+        return linha
+
+    creditos_minimos = {"restrita": restrita, "condicionada": condicionada, "livre": livre}
+    estatisticas = {}
+    inicio = time.perf_counter()
+    dica = construir_grade_gulosa(dados, creditos_minimos, num_semestres, creditos_maximos)
+    _, _, status, obj_value = resolver_grade(
+        dados, creditos_minimos, num_semestres, creditos_maximos,
+        dica=dica, configuracao=_configuracao, estatisticas=estatisticas
+    )
+    linha.update({
+        "status": status.name,
+        "objetivo": obj_value,
+        "tempo_s": round(time.perf_counter() - inicio, 4),
+        # Só as estatísticas que o relatório declara em CAMPOS ('resolver_grade' pode devolver outras)
+        **{chave: valor for chave, valor in estatisticas.items() if chave in CAMPOS},
+    })
+    return linha
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Varre uma grade de parâmetros (semestres, limite de créditos, mínimos por categoria) "
+                    "em paralelo e grava um resultado por linha à medida que cada ponto termina."
+    )
+    parser.add_argument("--conjuntos", nargs="+", default=["./attempt1"],
+                        help="Diretórios com 'disciplinas.json' e 'ofertas.json'")
+    parser.add_argument("--semestres", type=int, nargs="+", default=[10])
+    parser.add_argument("--creditos-maximos", type=int, nargs="+", default=[32])
+    parser.add_argument("--restrita", type=int, nargs="+", default=[4])
+    parser.add_argument("--condicionada", type=int, nargs="+", default=[40])
+    parser.add_argument("--livre", type=int, nargs="+", default=[8])
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1, help="Processos do pool")
+    parser.add_argument("--tempo-limite", type=float, default=120.0, help="Tempo limite do solver por ponto (s)")
+    parser.add_argument("--saida", default="varredura.jsonl",
+                        help="Arquivo de saída: CSV se terminar em '.csv', senão JSON lines")
+    args = parser.parse_args()
+
+    pontos = list(itertools.product(
+        args.conjuntos, args.semestres, args.creditos_maximos, args.restrita, args.condicionada, args.livre
+    ))
+    processos = max(1, min(args.processos, len(pontos)))
+    # Os núcleos são divididos entre os processos, para que as resoluções simultâneas não disputem CPU
+    configuracao = ConfiguracaoSolver(
+        num_workers=max(1, (os.cpu_count() or 1) // processos), tempo_limite=args.tempo_limite
+    )
+    print(f"{len(pontos)} pontos em {processos} processos.")
+
+    inicio = time.perf_counter()
+    formato_csv = args.saida.endswith(".csv")
+    with open(args.saida, 'w', encoding='utf-8', newline='') as f, \
+            multiprocessing.Pool(processos, initializer=_inicializar, initargs=(args.conjuntos, configuracao)) as pool:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS) if formato_csv else None
+        if escritor:
+            escritor.writeheader()
+        for i, linha in enumerate(pool.imap_unordered(_executar_ponto, pontos), 1):
+            if escritor:
+                escritor.writerow(linha)
+            else:
+                f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+            f.flush()
+            print(f"[{i}/{len(pontos)}] {linha['conjunto']} N={linha['num_semestres']} cap={linha['creditos_maximos']} "
+                  f"min=({linha['restrita']}, {linha['condicionada']}, {linha['livre']}): "
+                  f"{linha['erro'] or linha['status']} {linha['objetivo'] if linha['objetivo'] is not None else ''}")
+
+    print(f"\nVarredura concluída em {time.perf_counter() - inicio:.2f} s; resultados em '{args.saida}'.")
+
+if __name__ == '__main__':
+    main()